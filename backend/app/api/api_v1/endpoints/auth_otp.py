@@ -11,12 +11,20 @@ from jose import jwt, JWTError
 from app.core import security
 from app.core.config import settings
 from app.db.dev_store import dev_store
-from app.services.email_service import email_service
+from app.services.email_service import email_service, OTPRecentlySentError
 
 security_bearer = HTTPBearer(auto_error=False)
 
 router = APIRouter()
 
+
+async def _send_otp(email: str, purpose: str) -> str:
+    """Send an OTP email, answering 429 inside the resend cooldown"""
+    try:
+        return await email_service.send_otp_email(email, purpose=purpose)
+    except OTPRecentlySentError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
 class RequestOTPRequest(BaseModel):
     email: EmailStr
     full_name: Optional[str] = ""
@@ -56,7 +64,7 @@ async def request_otp(data: RequestOTPRequest) -> Any:
             full_name=data.full_name or ""
         )
         # Send activation OTP
-        email_service.send_otp_email(data.email, purpose="activation")
+        await _send_otp(data.email, purpose="activation")
         return {
             "message": "Account created. Please check your email for activation code.",
             "is_new_user": True,
@@ -66,7 +74,7 @@ async def request_otp(data: RequestOTPRequest) -> Any:
         # Existing user
         if not user.is_verified:
             # Resend activation OTP
-            email_service.send_otp_email(data.email, purpose="activation")
+            await _send_otp(data.email, purpose="activation")
             return {
                 "message": "Your account is not activated. Please check your email for activation code.",
                 "is_new_user": False,
@@ -75,7 +83,7 @@ async def request_otp(data: RequestOTPRequest) -> Any:
             }
         else:
             # Send login OTP
-            otp = email_service.send_otp_email(data.email, purpose="login")
+            otp = await _send_otp(data.email, purpose="login")
             result = {
                 "message": "Login code sent to your email.",
                 "is_new_user": False,
@@ -150,7 +158,7 @@ async def verify_otp(data: VerifyOTPRequest) -> Token:
     purpose = "activation" if not user.is_verified else "login"
     
     # Verify OTP
-    if not email_service.verify_otp(data.email, data.otp, purpose):
+    if not await email_service.verify_otp(data.email, data.otp, purpose):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired code. Please try again."
@@ -204,7 +212,7 @@ async def resend_otp(data: ResendOTPRequest) -> Any:
     purpose = "activation" if not user.is_verified else "login"
     
     # Send OTP
-    otp = email_service.send_otp_email(data.email, purpose=purpose)
+    otp = await _send_otp(data.email, purpose=purpose)
     
     result = {
         "message": f"New code sent to {data.email}",
@@ -9,11 +9,19 @@ import asyncio
 
 from app.core import security
 from app.core.config import settings
-from app.services.email_service import email_service
+from app.services.email_service import email_service, OTPRecentlySentError
 from app.services.supabase_client import supabase_service
 
 router = APIRouter()
 
+
+async def _send_otp(email: str, purpose: str) -> str:
+    """Send an OTP email, answering 429 inside the resend cooldown"""
+    try:
+        return await email_service.send_otp_email(email, purpose=purpose)
+    except OTPRecentlySentError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
 class RequestOTPRequest(BaseModel):
     email: EmailStr
     full_name: Optional[str] = ""
@@ -53,7 +61,7 @@ async def request_otp(data: RequestOTPRequest) -> Any:
             is_verified=False
         )
         # Send activation OTP
-        email_service.send_otp_email(data.email, purpose="activation")
+        await _send_otp(data.email, purpose="activation")
         return {
             "message": "Account created. Please check your email for activation code.",
             "is_new_user": True,
@@ -61,7 +69,7 @@ async def request_otp(data: RequestOTPRequest) -> Any:
         }
     else:
         # Existing user - send login OTP
-        email_service.send_otp_email(data.email, purpose="login")
+        await _send_otp(data.email, purpose="login")
         return {
             "message": "Login code sent to your email.",
             "is_new_user": False,
@@ -86,7 +94,7 @@ async def verify_otp(data: VerifyOTPRequest) -> Token:
     # Verify OTP
     purpose = "activation" if not user.get("is_active") else "login"
     
-    if not email_service.verify_otp(data.email, data.otp, purpose):
+    if not await email_service.verify_otp(data.email, data.otp, purpose):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired code. Please try again."
@@ -129,7 +137,7 @@ async def resend_otp(data: ResendOTPRequest) -> Any:
     purpose = "activation" if not user.get("is_active") else "login"
     
     # Send OTP
-    email_service.send_otp_email(data.email, purpose=purpose)
+    await _send_otp(data.email, purpose=purpose)
     
     return {
         "message": f"New code sent to {data.email}",
@@ -1,5 +1,6 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from uuid import UUID
 import logging
 
@@ -21,6 +22,13 @@ if settings.DEV_MODE:
 
 router = APIRouter()
 
+# Renders the list response exactly as response_model=List[Card] would
+_card_list = TypeAdapter(List[Card])
+
+
+def _encode_cards(cards: List[dict]) -> bytes:
+    return _card_list.dump_json(_card_list.validate_python(cards))
+
 
 @router.get("/", response_model=List[Card])
 async def read_cards(
@@ -36,8 +44,8 @@ async def read_cards(
     try:
         # Get or create dev user
         user = await db_service.get_or_create_user(current_user.email if hasattr(current_user, 'email') else "dev@example.com")
-        cards = await db_service.get_cards(user["id"])
-        return cards
+        body = await db_service.get_cards_json(user["id"], _encode_cards)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting cards: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch cards")
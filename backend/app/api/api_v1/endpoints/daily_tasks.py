@@ -1,5 +1,6 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from uuid import UUID
 import logging
 from datetime import datetime
@@ -7,7 +8,7 @@ from datetime import datetime
 from app.api import deps_simple
 from app.api.deps_simple import SimpleUser
 from app.schemas.daily_task import DailyTask, DailyTaskCreate, DailyTaskUpdate
-from app.models.daily_task import TaskLane
+from app.models.enums import TaskLane
 from app.core.config import settings
 from app.services.memory_db import memory_db_service as db_service
 
@@ -15,6 +16,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Renders the list response exactly as response_model=List[DailyTask] would
+_daily_task_list = TypeAdapter(List[DailyTask])
+
+
+def _encode_daily_tasks(tasks: List[dict]) -> bytes:
+    return _daily_task_list.dump_json(_daily_task_list.validate_python(tasks))
+
 
 @router.get("/", response_model=List[DailyTask])
 async def read_daily_tasks(
@@ -26,8 +34,8 @@ async def read_daily_tasks(
     try:
         # Get or create dev user
         user = await db_service.get_or_create_user(current_user.email if hasattr(current_user, 'email') else "dev@example.com")
-        tasks = await db_service.get_daily_tasks(user["id"])
-        return tasks
+        body = await db_service.get_daily_tasks_json(user["id"], _encode_daily_tasks)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting daily tasks: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch daily tasks")
@@ -33,9 +33,11 @@ async def read_all_focus_tasks(
         from app.api.mock_data import get_all_mock_focus_tasks
         return get_all_mock_focus_tasks(current_user.id)
     
-    # Use Supabase for production
-    tasks = await db_service.get_focus_tasks()
-    return tasks if tasks else []
+    # Use Supabase for production: one query for the user's cards, one
+    # batched query for all of their tasks
+    cards = await db_service.get_cards(str(current_user.id))
+    tasks_by_card = await db_service.get_focus_tasks_for_cards([card["id"] for card in cards])
+    return [task for card in cards for task in tasks_by_card.get(card["id"], [])]
 
 
 @router.get("/card/{card_id}", response_model=List[FocusTask])
@@ -52,13 +54,12 @@ async def read_focus_tasks_by_card(
             raise HTTPException(status_code=404, detail="Card not found")
         return get_mock_focus_tasks(card_id)
     
-    # Use Supabase for production
-    card = await db_service.get_card(str(card_id), str(current_user.id))
+    # Use Supabase for production; ownership check and tasks in one round-trip
+    card = await db_service.get_card_with_tasks(str(card_id), str(current_user.id))
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
     
-    tasks = await db_service.get_focus_tasks(card_id=str(card_id))
-    return tasks
+    return card["focus_tasks"]
 
 
 @router.post("/", response_model=FocusTask)
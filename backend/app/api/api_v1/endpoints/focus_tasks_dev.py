@@ -55,11 +55,12 @@ async def get_all_focus_tasks(
     user_cards = dev_store.get_cards(current_user.id)
     card_ids = [card.id for card in user_cards]
     
-    # Return tasks for those cards
+    # Return tasks for those cards. Stored tasks were validated on write,
+    # so skip re-validation here.
     tasks = []
     for task_id, task in focus_tasks_store.items():
         if task['card_id'] in card_ids:
-            tasks.append(FocusTask(**task))
+            tasks.append(FocusTask.model_construct(**task))
     
     return tasks
 
@@ -78,11 +79,11 @@ async def get_focus_tasks_by_card(
     if not card_exists:
         raise HTTPException(status_code=404, detail="Card not found")
     
-    # Return tasks for this card
+    # Return tasks for this card (trusted store data, see above)
     tasks = []
     for task_id, task in focus_tasks_store.items():
         if task['card_id'] == card_id:
-            tasks.append(FocusTask(**task))
+            tasks.append(FocusTask.model_construct(**task))
     
     return tasks
 
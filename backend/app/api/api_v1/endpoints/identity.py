@@ -11,7 +11,7 @@ from app.models.identity import (
 from app.core.config import settings
 from app.services.memory_db import memory_db
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 router = APIRouter()
 
@@ -62,8 +62,8 @@ async def create_identity_settings(
             order=i,
             strength=0,
             related_habit_ids=[],
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc)
         )
         statements.append(stmt.dict())
     
@@ -73,8 +73,8 @@ async def create_identity_settings(
         user_id=user_id,
         statements=statements,
         reminder_settings=settings_in.reminder_settings.dict(),
-        created_at=datetime.now(),
-        updated_at=datetime.now()
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc)
     )
     
     memory_db[settings_key] = settings.dict()
@@ -98,7 +98,7 @@ async def update_identity_settings(
     if settings_update.reminder_settings:
         current_settings["reminder_settings"] = settings_update.reminder_settings.dict()
     
-    current_settings["updated_at"] = datetime.now().isoformat()
+    current_settings["updated_at"] = datetime.now(timezone.utc).isoformat()
     memory_db[settings_key] = current_settings
     
     return current_settings
@@ -129,12 +129,12 @@ async def add_identity_statement(
         order=len(settings["statements"]),
         strength=0,
         related_habit_ids=[],
-        created_at=datetime.now(),
-        updated_at=datetime.now()
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc)
     )
     
     settings["statements"].append(new_statement.dict())
-    settings["updated_at"] = datetime.now().isoformat()
+    settings["updated_at"] = datetime.now(timezone.utc).isoformat()
     memory_db[settings_key] = settings
     
     return new_statement
@@ -161,10 +161,10 @@ async def update_identity_statement(
             update_data = statement_update.dict(exclude_unset=True)
             for field, value in update_data.items():
                 stmt[field] = value
-            stmt["updated_at"] = datetime.now().isoformat()
+            stmt["updated_at"] = datetime.now(timezone.utc).isoformat()
             
             settings["statements"][i] = stmt
-            settings["updated_at"] = datetime.now().isoformat()
+            settings["updated_at"] = datetime.now(timezone.utc).isoformat()
             memory_db[settings_key] = settings
             return stmt
     
@@ -194,7 +194,7 @@ async def delete_identity_statement(
     for i, stmt in enumerate(settings["statements"]):
         stmt["order"] = i
     
-    settings["updated_at"] = datetime.now().isoformat()
+    settings["updated_at"] = datetime.now(timezone.utc).isoformat()
     memory_db[settings_key] = settings
     
     return {"detail": "Statement deleted successfully"}
@@ -220,9 +220,9 @@ async def strengthen_identity_statement(
                 stmt["related_habit_ids"].append(habit_id)
                 # Recalculate strength (simple formula: 20 points per habit, max 100)
                 stmt["strength"] = min(len(stmt["related_habit_ids"]) * 20, 100)
-                stmt["updated_at"] = datetime.now().isoformat()
+                stmt["updated_at"] = datetime.now(timezone.utc).isoformat()
             
-            settings["updated_at"] = datetime.now().isoformat()
+            settings["updated_at"] = datetime.now(timezone.utc).isoformat()
             memory_db[settings_key] = settings
             return {"detail": "Statement strengthened", "strength": stmt["strength"]}
     
@@ -1,13 +1,18 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 from app.schemas.card import Card, CardWithTasks
 from app.schemas.focus_task import FocusTask
 from app.schemas.daily_task import DailyTask
-from app.models.card import CardStatus
+from app.models.card import CardStatus, CARD_STATUS_BY_VALUE
+from app.models.enums import TASK_LANE_BY_VALUE, FOCUS_TASK_STATUS_BY_VALUE
 
-# Mock data storage
-mock_cards: List[dict] = [
+# Seed cards for the mock user
+#
+# Everything held in the store was either seeded here or validated by a
+# create_/update_ function on the way in, so read paths rebuild schemas with
+# model_construct() and skip re-validation.
+_SEED_CARDS: List[dict] = [
     {
         "id": uuid4(),
         "user_id": UUID('12345678-1234-5678-1234-567812345678'),
@@ -55,24 +60,129 @@ mock_cards: List[dict] = [
     }
 ]
 
-mock_focus_tasks: List[dict] = []
 
-mock_daily_tasks: List[dict] = []
+class MockStore:
+    """In-memory tables for dev mode, with per-user and per-card indexes"""
+    __slots__ = (
+        "cards", "focus_tasks", "daily_tasks",
+        "cards_by_user", "focus_tasks_by_card", "daily_tasks_by_card",
+    )
+
+    def __init__(self, seed_cards: List[dict]):
+        self.cards: List[dict] = []
+        self.focus_tasks: List[dict] = []
+        self.daily_tasks: List[dict] = []
+        # Indexes keyed by str(id) so UUID and string ids resolve alike
+        self.cards_by_user: Dict[str, List[dict]] = {}
+        self.focus_tasks_by_card: Dict[str, List[dict]] = {}
+        self.daily_tasks_by_card: Dict[str, List[dict]] = {}
+        for card in seed_cards:
+            self.add_card(card)
+
+    # Cards
+    def add_card(self, card: dict) -> None:
+        self.cards.append(card)
+        self.cards_by_user.setdefault(str(card["user_id"]), []).append(card)
+
+    def cards_for_user(self, user_id: UUID) -> List[dict]:
+        return self.cards_by_user.get(str(user_id), [])
+
+    def find_card(self, card_id: UUID, user_id: UUID) -> Optional[dict]:
+        card_id_str = str(card_id)
+        for card in self.cards_for_user(user_id):
+            if str(card["id"]) == card_id_str:
+                return card
+        return None
+
+    def remove_card(self, card: dict) -> None:
+        self.cards.remove(card)
+        self.cards_by_user[str(card["user_id"])].remove(card)
+
+    # Focus tasks
+    def add_focus_task(self, task: dict) -> None:
+        self.focus_tasks.append(task)
+        self.focus_tasks_by_card.setdefault(str(task.get("card_id")), []).append(task)
+
+    def focus_tasks_for_card(self, card_id: UUID) -> List[dict]:
+        return self.focus_tasks_by_card.get(str(card_id), [])
+
+    def find_focus_task(self, task_id: UUID) -> Optional[dict]:
+        task_id_str = str(task_id)
+        for task in self.focus_tasks:
+            if str(task.get("id")) == task_id_str:
+                return task
+        return None
+
+    def move_focus_task(self, task: dict, old_card_id: UUID) -> None:
+        self.focus_tasks_by_card[str(old_card_id)].remove(task)
+        self.focus_tasks_by_card.setdefault(str(task.get("card_id")), []).append(task)
+
+    def remove_focus_task(self, task: dict) -> None:
+        self.focus_tasks.remove(task)
+        self.focus_tasks_by_card[str(task.get("card_id"))].remove(task)
+
+    # Daily tasks
+    def add_daily_task(self, task: dict) -> None:
+        self.daily_tasks.append(task)
+        self.daily_tasks_by_card.setdefault(str(task.get("card_id")), []).append(task)
+
+    def daily_tasks_for_card(self, card_id: UUID) -> List[dict]:
+        return self.daily_tasks_by_card.get(str(card_id), [])
+
+    def find_daily_task(self, task_id: UUID) -> Optional[dict]:
+        for task in self.daily_tasks:
+            if task.get("id") == task_id:
+                return task
+        return None
+
+    def remove_daily_task(self, task: dict) -> None:
+        self.daily_tasks.remove(task)
+        self.daily_tasks_by_card[str(task.get("card_id"))].remove(task)
+
+
+_store = MockStore(_SEED_CARDS)
+
+def _sample_task_specs(card_id: UUID) -> List[dict]:
+    """Sample focus tasks seeded into an empty card"""
+    from app.models.enums import TaskLane, FocusTaskStatus as TaskStatus
+    now = datetime.now()
+    return [
+        {
+            "id": uuid4(),
+            "card_id": card_id,
+            "title": "Sample Task 1",
+            "description": "This is a sample task in the controller lane",
+            "status": TaskStatus.ACTIVE,
+            "lane": TaskLane.CONTROLLER,
+            "position": 0,
+            "date": None,
+            "tags": [],
+            "created_at": now,
+            "updated_at": now
+        },
+        {
+            "id": uuid4(),
+            "card_id": card_id,
+            "title": "Sample Task 2",
+            "description": "This is a sample task in the main lane",
+            "status": TaskStatus.ACTIVE,
+            "lane": TaskLane.MAIN,
+            "position": 0,
+            "date": None,
+            "tags": [],
+            "created_at": now,
+            "updated_at": now
+        }
+    ]
 
 def get_mock_cards(user_id: UUID) -> List[Card]:
     """Get all cards for a user"""
-    user_id_str = str(user_id)
-    user_cards = [card for card in mock_cards if str(card["user_id"]) == user_id_str]
-    return [Card(**card) for card in user_cards]
+    return [Card.model_construct(**card) for card in _store.cards_for_user(user_id)]
 
 def get_mock_card(card_id: UUID, user_id: UUID) -> Optional[Card]:
     """Get a single card"""
-    card_id_str = str(card_id)
-    user_id_str = str(user_id)
-    for card in mock_cards:
-        if str(card["id"]) == card_id_str and str(card["user_id"]) == user_id_str:
-            return Card(**card)
-    return None
+    card = _store.find_card(card_id, user_id)
+    return Card.model_construct(**card) if card else None
 
 def get_mock_card_with_tasks(card_id: UUID, user_id: UUID) -> Optional[CardWithTasks]:
     """Get a card with its tasks"""
@@ -81,43 +191,14 @@ def get_mock_card_with_tasks(card_id: UUID, user_id: UUID) -> Optional[CardWithT
         return None
     
     # Get existing tasks for this card
-    focus_tasks = [FocusTask(**task) for task in mock_focus_tasks if str(task.get("card_id")) == str(card_id)]
-    daily_tasks = [DailyTask(**task) for task in mock_daily_tasks if str(task.get("card_id")) == str(card_id)]
+    focus_tasks = [FocusTask.model_construct(**task) for task in _store.focus_tasks_for_card(card_id)]
+    daily_tasks = [DailyTask.model_construct(**task) for task in _store.daily_tasks_for_card(card_id)]
     
     # If no focus tasks exist for this card, create some sample tasks
     if not focus_tasks:
-        from app.models.focus_task import TaskStatus
-        sample_tasks = [
-            {
-                "id": uuid4(),
-                "card_id": card_id,
-                "title": "Sample Task 1",
-                "description": "This is a sample task in the controller lane",
-                "status": TaskStatus.ACTIVE,
-                "lane": "controller",
-                "position": 0,
-                "date": None,
-                "tags": [],
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
-            },
-            {
-                "id": uuid4(),
-                "card_id": card_id,
-                "title": "Sample Task 2",
-                "description": "This is a sample task in the main lane",
-                "status": TaskStatus.ACTIVE,
-                "lane": "main",
-                "position": 0,
-                "date": None,
-                "tags": [],
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
-            }
-        ]
-        # Add these tasks to the mock storage
-        mock_focus_tasks.extend(sample_tasks)
-        focus_tasks = [FocusTask(**task) for task in sample_tasks]
+        for spec in _sample_task_specs(card_id):
+            _store.add_focus_task(spec)
+            focus_tasks.append(FocusTask.model_construct(**spec))
     
     return CardWithTasks(
         **card.dict(),
@@ -132,7 +213,7 @@ def create_mock_card(card_data: dict, user_id: UUID) -> Card:
         "user_id": user_id,
         "title": card_data.get("title", "New Card"),
         "description": card_data.get("description", ""),
-        "position": card_data.get("position", len(mock_cards)),
+        "position": card_data.get("position", len(_store.cards)),
         "status": CardStatus.QUEUED,
         "pause_until": None,
         "last_worked_on": None,
@@ -142,60 +223,57 @@ def create_mock_card(card_data: dict, user_id: UUID) -> Card:
         "created_at": datetime.now(),
         "updated_at": datetime.now()
     }
-    mock_cards.append(new_card)
+    _store.add_card(new_card)
     return Card(**new_card)
 
 def update_mock_card(card_id: UUID, card_data: dict, user_id: UUID) -> Optional[Card]:
     """Update an existing card"""
+    status = card_data.get("status")
+    if status is not None:
+        status = CARD_STATUS_BY_VALUE.get(status, status)
+        card_data = {**card_data, "status": status}
+    
     # SAFETY: If setting a card to active, ensure no other cards are active
-    if card_data.get("status") == CardStatus.ACTIVE or card_data.get("status") == "active":
+    if status is CardStatus.ACTIVE:
         # First deactivate all other active cards for this user
-        for card in mock_cards:
-            if (card["user_id"] == user_id and 
-                card["id"] != card_id and 
-                card["status"] == CardStatus.ACTIVE):
+        for card in _store.cards_for_user(user_id):
+            if card["id"] != card_id and card["status"] is CardStatus.ACTIVE:
                 card["status"] = CardStatus.QUEUED
                 card["updated_at"] = datetime.now()
     
     # Now update the requested card
-    for i, card in enumerate(mock_cards):
-        if card["id"] == card_id and card["user_id"] == user_id:
-            for key, value in card_data.items():
-                if value is not None:
-                    card[key] = value
-            card["updated_at"] = datetime.now()
-            mock_cards[i] = card
-            return Card(**card)
-    return None
+    card = _store.find_card(card_id, user_id)
+    if not card:
+        return None
+    for key, value in card_data.items():
+        if value is not None:
+            card[key] = value
+    card["updated_at"] = datetime.now()
+    return Card(**card)
 
 def delete_mock_card(card_id: UUID, user_id: UUID) -> Optional[Card]:
     """Delete a card"""
-    for i, card in enumerate(mock_cards):
-        if card["id"] == card_id and card["user_id"] == user_id:
-            deleted_card = mock_cards.pop(i)
-            return Card(**deleted_card)
-    return None
+    card = _store.find_card(card_id, user_id)
+    if not card:
+        return None
+    _store.remove_card(card)
+    return Card.model_construct(**card)
 
 def get_mock_focus_tasks(card_id: UUID) -> List[FocusTask]:
     """Get focus tasks for a card"""
-    card_id_str = str(card_id)
-    tasks = [task for task in mock_focus_tasks if str(task.get("card_id")) == card_id_str]
-    return [FocusTask(**task) for task in tasks]
+    return [FocusTask.model_construct(**task) for task in _store.focus_tasks_for_card(card_id)]
 
 def get_all_mock_focus_tasks(user_id: UUID) -> List[FocusTask]:
     """Get all focus tasks for a user"""
-    # Get all cards for the user first
-    user_id_str = str(user_id)
-    user_cards = [card for card in mock_cards if str(card.get("user_id")) == user_id_str]
-    card_ids = [str(card.get("id")) for card in user_cards]
-    
-    # Get all tasks for those cards
-    tasks = [task for task in mock_focus_tasks if str(task.get("card_id")) in card_ids]
-    return [FocusTask(**task) for task in tasks]
+    return [
+        FocusTask.model_construct(**task)
+        for card in _store.cards_for_user(user_id)
+        for task in _store.focus_tasks_for_card(card["id"])
+    ]
 
 def create_mock_focus_task(task_data: dict) -> FocusTask:
     """Create a new focus task"""
-    from app.models.focus_task import TaskStatus
+    from app.models.enums import FocusTaskStatus as TaskStatus
     
     task_id = uuid4()
     new_task = {
@@ -211,29 +289,38 @@ def create_mock_focus_task(task_data: dict) -> FocusTask:
         "created_at": datetime.now(),
         "updated_at": datetime.now()
     }
-    mock_focus_tasks.append(new_task)
+    _store.add_focus_task(new_task)
     print(f"Created focus task with ID: {task_id}")
     return FocusTask(**new_task)
 
+def _normalize_focus_task_enums(values: dict) -> dict:
+    """Map raw lane/status strings from JSON onto their enum members"""
+    values = dict(values)
+    if values.get("lane") is not None:
+        values["lane"] = TASK_LANE_BY_VALUE.get(values["lane"], values["lane"])
+    if values.get("status") is not None:
+        values["status"] = FOCUS_TASK_STATUS_BY_VALUE.get(values["status"], values["status"])
+    return values
+
 def update_mock_focus_task(task_id: UUID, updates: dict) -> Optional[FocusTask]:
     """Update an existing focus task"""
+    updates = _normalize_focus_task_enums(updates)
     # First check if the task exists, if not create it with the updates
-    # Convert task_id to string for comparison
-    task_id_str = str(task_id)
-    for i, task in enumerate(mock_focus_tasks):
-        # Compare as strings to handle both UUID and string IDs
-        if str(task.get("id")) == task_id_str:
-            for key, value in updates.items():
-                if value is not None:
-                    task[key] = value
-            task["updated_at"] = datetime.now()
-            mock_focus_tasks[i] = task
-            print(f"Updated focus task with ID: {task_id}")
-            return FocusTask(**task)
+    task = _store.find_focus_task(task_id)
+    if task:
+        old_card_id = task.get("card_id")
+        for key, value in updates.items():
+            if value is not None:
+                task[key] = value
+        task["updated_at"] = datetime.now()
+        if str(task.get("card_id")) != str(old_card_id):
+            _store.move_focus_task(task, old_card_id)
+        print(f"Updated focus task with ID: {task_id}")
+        return FocusTask(**task)
     
     # Task doesn't exist - this can happen when frontend has tasks from initial card data
     # Create a new task with the given ID and updates
-    from app.models.focus_task import TaskStatus
+    from app.models.enums import FocusTaskStatus as TaskStatus
     print(f"Task {task_id} not found, creating new task with updates")
     new_task = {
         "id": task_id,
@@ -253,27 +340,24 @@ def update_mock_focus_task(task_id: UUID, updates: dict) -> Optional[FocusTask]:
         if value is not None and key not in new_task:
             new_task[key] = value
     
-    mock_focus_tasks.append(new_task)
+    _store.add_focus_task(new_task)
     return FocusTask(**new_task)
 
 def delete_mock_focus_task(task_id: UUID) -> Optional[FocusTask]:
     """Delete a focus task"""
-    global mock_focus_tasks
-    task_id_str = str(task_id)
-    for i, task in enumerate(mock_focus_tasks):
-        if str(task.get("id")) == task_id_str:
-            deleted_task = mock_focus_tasks.pop(i)
-            return FocusTask(**deleted_task)
-    return None
+    task = _store.find_focus_task(task_id)
+    if not task:
+        return None
+    _store.remove_focus_task(task)
+    return FocusTask.model_construct(**task)
 
 def get_mock_daily_tasks(card_id: UUID) -> List[DailyTask]:
     """Get daily tasks for a card"""
-    tasks = [task for task in mock_daily_tasks if task.get("card_id") == card_id]
-    return [DailyTask(**task) for task in tasks]
+    return [DailyTask.model_construct(**task) for task in _store.daily_tasks_for_card(card_id)]
 
 def create_mock_daily_task(task_data: dict) -> DailyTask:
     """Create a new daily task"""
-    from app.models.daily_task import TaskStatus
+    from app.models.enums import DailyTaskStatus as TaskStatus
     
     new_task = {
         "id": uuid4(),
@@ -288,26 +372,24 @@ def create_mock_daily_task(task_data: dict) -> DailyTask:
         "created_at": datetime.now(),
         "updated_at": datetime.now()
     }
-    mock_daily_tasks.append(new_task)
+    _store.add_daily_task(new_task)
     return DailyTask(**new_task)
 
 def update_mock_daily_task(task_id: UUID, updates: dict) -> Optional[DailyTask]:
     """Update an existing daily task"""
-    for i, task in enumerate(mock_daily_tasks):
-        if task.get("id") == task_id:
-            for key, value in updates.items():
-                if value is not None:
-                    task[key] = value
-            task["updated_at"] = datetime.now()
-            mock_daily_tasks[i] = task
-            return DailyTask(**task)
-    return None
+    task = _store.find_daily_task(task_id)
+    if not task:
+        return None
+    for key, value in updates.items():
+        if value is not None:
+            task[key] = value
+    task["updated_at"] = datetime.now()
+    return DailyTask(**task)
 
 def delete_mock_daily_task(task_id: UUID) -> Optional[DailyTask]:
     """Delete a daily task"""
-    global mock_daily_tasks
-    for i, task in enumerate(mock_daily_tasks):
-        if task.get("id") == task_id:
-            deleted_task = mock_daily_tasks.pop(i)
-            return DailyTask(**deleted_task)
-    return None
\ No newline at end of file
+    task = _store.find_daily_task(task_id)
+    if not task:
+        return None
+    _store.remove_daily_task(task)
+    return DailyTask.model_construct(**task)
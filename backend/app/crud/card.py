@@ -1,18 +1,47 @@
-from typing import List, Optional
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 from uuid import UUID
 
 from app.crud.base import CRUDBase
-from app.models.card import Card
+from app.models.card import Card, CardStatus
 from app.schemas.card import CardCreate, CardUpdate
 
+# Per-request read cache. The middleware in app.main sets a fresh dict for
+# every request, so entries never outlive the request that produced them.
+# Outside a request (scripts, background jobs) the cache is disabled.
+_request_cache: ContextVar[Optional[Dict[tuple, Any]]] = ContextVar(
+    "card_request_cache", default=None
+)
+
+
+def start_request_cache() -> Token:
+    """Enable the card read cache for the current request"""
+    return _request_cache.set({})
+
+
+def reset_request_cache(token: Token) -> None:
+    """Drop the card read cache at the end of the request"""
+    _request_cache.reset(token)
+
+
+def _invalidate_request_cache() -> None:
+    cache = _request_cache.get()
+    if cache:
+        cache.clear()
+
 
 class CRUDCard(CRUDBase[Card, CardCreate, CardUpdate]):
     async def get_by_user(
         self, db: AsyncSession, *, user_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[Card]:
+        cache = _request_cache.get()
+        key = ("by_user", user_id, skip, limit)
+        if cache is not None and key in cache:
+            return cache[key]
+
         result = await db.execute(
             select(Card)
             .where(Card.user_id == user_id)
@@ -20,9 +49,14 @@ class CRUDCard(CRUDBase[Card, CardCreate, CardUpdate]):
             .offset(skip)
             .limit(limit)
         )
-        return result.scalars().all()
+        cards = result.scalars().all()
+        if cache is not None:
+            cache[key] = cards
+        return cards
 
     async def get_with_tasks(self, db: AsyncSession, *, id: UUID) -> Optional[Card]:
+        # Not cached: task CRUD writes the loaded tasks without going through
+        # CRUDCard, so a cached copy would go stale within the request
         result = await db.execute(
             select(Card)
             .options(selectinload(Card.focus_tasks), selectinload(Card.daily_tasks))
@@ -35,7 +69,47 @@ class CRUDCard(CRUDBase[Card, CardCreate, CardUpdate]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        _invalidate_request_cache()
         return db_obj
 
+    async def set_active(
+        self, db: AsyncSession, *, user_id: UUID, card_id: UUID
+    ) -> Optional[Card]:
+        """Make card_id the user's only active card in one transaction"""
+        # Set-based demotion instead of a read-modify-write loop; the partial
+        # unique index ux_cards_one_active_per_user rejects concurrent races.
+        await db.execute(
+            update(Card)
+            .where(
+                Card.user_id == user_id,
+                Card.status == CardStatus.ACTIVE,
+                Card.id != card_id,
+            )
+            .values(status=CardStatus.QUEUED)
+        )
+        result = await db.execute(
+            update(Card)
+            .where(Card.id == card_id, Card.user_id == user_id)
+            .values(status=CardStatus.ACTIVE)
+            .returning(Card)
+        )
+        card = result.scalar_one_or_none()
+        if card is None:
+            await db.rollback()
+            return None
+        await db.commit()
+        _invalidate_request_cache()
+        return card
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: Card, obj_in: Union[CardUpdate, Dict[str, Any]]
+    ) -> Card:
+        _invalidate_request_cache()
+        return await super().update(db, db_obj=db_obj, obj_in=obj_in)
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Card:
+        _invalidate_request_cache()
+        return await super().remove(db, id=id)
+
 
-card_crud = CRUDCard(Card)
\ No newline at end of file
+card_crud = CRUDCard(Card)
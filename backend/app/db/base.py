@@ -1,3 +1,11 @@
+import enum
+from typing import Type
+
 from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+
+def enum_check(column: str, values: Type[enum.Enum]) -> str:
+    """SQL CHECK expression restricting a string column to an enum's values"""
+    return f"{column} IN ({', '.join(repr(e.value) for e in values)})"
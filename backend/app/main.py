@@ -1,7 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api.api_v1.api import api_router
 from app.core.config import settings
+from app.crud.card import start_request_cache, reset_request_cache
+from app.services.email_service import email_service
+from app.services.memory_db import seed_test_data, should_seed_test_data
+from app.services.otp_service import close_resend_client, otp_service
 import logging
 
 # Configure logging
@@ -15,6 +20,7 @@ logging.basicConfig(
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -27,8 +33,50 @@ app.add_middleware(
     max_age=3600,
 )
 
+
+@app.middleware("http")
+async def card_read_cache(request, call_next):
+    # Scope the CRUDCard read cache to a single request
+    token = start_request_cache()
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_cache(token)
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+@app.on_event("startup")
+async def start_email_tasks():
+    email_service.start_otp_sweeper()
+    email_service.start_send_workers()
+
+
+@app.on_event("startup")
+async def start_auth_code_purge():
+    otp_service.start_code_purger()
+
+
+@app.on_event("startup")
+def load_test_data():
+    if should_seed_test_data():
+        seed_test_data()
+
+
+@app.on_event("shutdown")
+async def close_email_connection():
+    email_service.stop_otp_sweeper()
+    await email_service.stop_send_workers()
+    await email_service.aclose()
+
+
+@app.on_event("shutdown")
+async def close_resend_connection():
+    otp_service.stop_code_purger()
+    await close_resend_client()
+
+
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
\ No newline at end of file
@@ -1,7 +1,6 @@
-import uuid
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 import enum
 
@@ -16,10 +15,14 @@ class CardStatus(str, enum.Enum):
     COMPLETED = "completed"
 
 
+# Raw string -> member lookup for normalizing JSON input without Enum() calls
+CARD_STATUS_BY_VALUE = {e.value: e for e in CardStatus}
+
+
 class Card(Base):
     __tablename__ = "cards"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     position = Column(Integer, nullable=False, default=0)
@@ -35,4 +38,15 @@ class Card(Base):
 
     # Relationships
     user = relationship("User", back_populates="cards")
+
+    __table_args__ = (
+        Index("ix_cards_user_position", user_id, position),
+        # At most one active card per user
+        Index(
+            "ux_cards_one_active_per_user",
+            user_id,
+            unique=True,
+            postgresql_where=(status == CardStatus.ACTIVE),
+        ),
+    )
     focus_tasks = relationship("FocusTask", back_populates="card", cascade="all, delete-orphan")
\ No newline at end of file
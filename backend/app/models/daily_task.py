@@ -1,44 +1,44 @@
-import uuid
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
-import enum
 
-from app.db.base import Base
+from app.db.base import Base, enum_check
+from app.models.enums import (
+    TaskLane,
+    TaskDuration,
+    DailyTaskStatus,
+    DAILY_TASK_STATUS_BY_VALUE,
+)
 
 
-class TaskLane(str, enum.Enum):
-    CONTROLLER = "controller"
-    MAIN = "main"
-
-
-class TaskDuration(str, enum.Enum):
-    TEN_MIN = "10min"
-    FIFTEEN_MIN = "15min"
-    THIRTY_MIN = "30min"
-
-
-class TaskStatus(str, enum.Enum):
-    PENDING = "pending"
-    COMPLETED = "completed"
-    ARCHIVED = "archived"
+# Shared task enums live in app.models.enums; re-exported under the names
+# this module has always provided
+TaskStatus = DailyTaskStatus
+TASK_STATUS_BY_VALUE = DAILY_TASK_STATUS_BY_VALUE
 
 
 class DailyTask(Base):
     __tablename__ = "daily_tasks"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    lane = Column(Enum(TaskLane), default=TaskLane.CONTROLLER)
-    duration = Column(Enum(TaskDuration), nullable=True)
-    status = Column(Enum(TaskStatus), default=TaskStatus.PENDING)
+    lane = Column(String(16), default=TaskLane.CONTROLLER.value)
+    duration = Column(String(16), nullable=True)
+    status = Column(String(16), default=DailyTaskStatus.PENDING.value)
     position = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    user = relationship("User", back_populates="daily_tasks")
\ No newline at end of file
+    user = relationship("User", back_populates="daily_tasks")
+
+    __table_args__ = (
+        Index("ix_daily_tasks_user_position", user_id, position),
+        CheckConstraint(enum_check("lane", TaskLane), name="ck_daily_tasks_lane"),
+        CheckConstraint(enum_check("duration", TaskDuration), name="ck_daily_tasks_duration"),
+        CheckConstraint(enum_check("status", DailyTaskStatus), name="ck_daily_tasks_status"),
+    )
\ No newline at end of file
@@ -0,0 +1,32 @@
+import enum
+
+
+class TaskLane(str, enum.Enum):
+    CONTROLLER = "controller"
+    MAIN = "main"
+
+
+class FocusTaskStatus(str, enum.Enum):
+    PENDING = "pending"
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    ARCHIVED = "archived"
+
+
+class DailyTaskStatus(str, enum.Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    ARCHIVED = "archived"
+
+
+class TaskDuration(str, enum.Enum):
+    TEN_MIN = "10min"
+    FIFTEEN_MIN = "15min"
+    THIRTY_MIN = "30min"
+
+
+# Raw string -> member lookups for normalizing JSON input without Enum() calls
+TASK_LANE_BY_VALUE = {e.value: e for e in TaskLane}
+FOCUS_TASK_STATUS_BY_VALUE = {e.value: e for e in FocusTaskStatus}
+DAILY_TASK_STATUS_BY_VALUE = {e.value: e for e in DailyTaskStatus}
+TASK_DURATION_BY_VALUE = {e.value: e for e in TaskDuration}
@@ -1,34 +1,27 @@
-import uuid
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Enum, Date, ARRAY
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Date, ARRAY, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
-import enum
 
-from app.db.base import Base
+from app.db.base import Base, enum_check
+from app.models.enums import TaskLane, FocusTaskStatus, FOCUS_TASK_STATUS_BY_VALUE
 
 
-class TaskLane(str, enum.Enum):
-    CONTROLLER = "controller"
-    MAIN = "main"
-
-
-class TaskStatus(str, enum.Enum):
-    PENDING = "pending"
-    ACTIVE = "active"
-    COMPLETED = "completed"
-    ARCHIVED = "archived"
+# Shared task enums live in app.models.enums; re-exported under the names
+# this module has always provided
+TaskStatus = FocusTaskStatus
+TASK_STATUS_BY_VALUE = FOCUS_TASK_STATUS_BY_VALUE
 
 
 class FocusTask(Base):
     __tablename__ = "focus_tasks"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     card_id = Column(UUID(as_uuid=True), ForeignKey("cards.id"), nullable=False)
-    lane = Column(Enum(TaskLane), default=TaskLane.CONTROLLER)
-    status = Column(Enum(TaskStatus), default=TaskStatus.PENDING)
+    lane = Column(String(16), default=TaskLane.CONTROLLER.value)
+    status = Column(String(16), default=FocusTaskStatus.PENDING.value)
     date = Column(Date, nullable=True)
     tags = Column(ARRAY(String), default=[])
     position = Column(Integer, nullable=False, default=0)
@@ -36,4 +29,10 @@ class FocusTask(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    card = relationship("Card", back_populates="focus_tasks")
\ No newline at end of file
+    card = relationship("Card", back_populates="focus_tasks")
+
+    __table_args__ = (
+        Index("ix_focus_tasks_card_position", card_id, position),
+        CheckConstraint(enum_check("lane", TaskLane), name="ck_focus_tasks_lane"),
+        CheckConstraint(enum_check("status", FocusTaskStatus), name="ck_focus_tasks_status"),
+    )
\ No newline at end of file
@@ -1,8 +1,9 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from typing import List, Optional, Literal
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from enum import Enum
-import uuid
+
+from app.core.ids import uuid7
 
 
 class HabitFrequency(str, Enum):
@@ -26,11 +27,20 @@ class FrequencyDetails(BaseModel):
     
     @validator('target_days')
     def validate_target_days(cls, v, values):
-        if values.get('type') == HabitFrequency.CUSTOM and v is None:
+        if values.get('type') is HabitFrequency.CUSTOM and v is None:
             raise ValueError("target_days required for custom frequency")
         return v
 
 
+# Days required for graduation, by frequency type
+_REQUIRED_DAYS = {
+    HabitFrequency.DAILY: 40,
+    HabitFrequency.WEEKLY: 90,
+}
+# Custom frequency, indexed by target days per week (1-7): 3+ days -> 60, 5+ -> 50
+_CUSTOM_REQUIRED_DAYS = (90, 90, 90, 60, 60, 50, 50, 50)
+
+
 class HabitBase(BaseModel):
     """Base model for habits"""
     title: str = Field(..., min_length=1, max_length=100, description="Habit title")
@@ -59,7 +69,7 @@ class HabitGraduate(BaseModel):
 
 class Habit(HabitBase):
     """Complete habit model"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     user_id: str
     lane: HabitLane = Field(HabitLane.BECOMING, description="Current lane")
     required_days: int = Field(40, description="Days required for graduation")
@@ -69,26 +79,17 @@ class Habit(HabitBase):
     longest_streak: int = Field(0, ge=0, description="Longest streak achieved")
     current_streak: int = Field(0, ge=0, description="Current active streak")
     total_completions: int = Field(0, ge=0, description="Total times completed")
-    start_date: datetime = Field(default_factory=datetime.now)
+    start_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     graduation_date: Optional[datetime] = None
     last_check_in: Optional[datetime] = None
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     def calculate_required_days(self) -> int:
         """Calculate required days based on frequency"""
-        if self.frequency.type == HabitFrequency.DAILY:
-            return 40
-        elif self.frequency.type == HabitFrequency.WEEKLY:
-            return 90
-        elif self.frequency.type == HabitFrequency.CUSTOM:
-            if self.frequency.target_days >= 5:
-                return 50
-            elif self.frequency.target_days >= 3:
-                return 60
-            else:
-                return 90
-        return 40
+        if self.frequency.type is HabitFrequency.CUSTOM:
+            return _CUSTOM_REQUIRED_DAYS[self.frequency.target_days]
+        return _REQUIRED_DAYS.get(self.frequency.type, 40)
 
     def can_graduate(self) -> bool:
         """Check if habit can graduate"""
@@ -96,15 +97,13 @@ class Habit(HabitBase):
         if self.current_day >= 21:
             return True
         # Auto graduation after required days with good consistency
-        if self.current_day >= self.required_days:
-            consistency = self.total_completions / max(self.current_day, 1)
-            return consistency >= 0.8
-        return False
+        # consistency >= 80%, kept in integer arithmetic: 5 * done >= 4 * days
+        return (
+            self.current_day >= self.required_days
+            and 5 * self.total_completions >= 4 * max(self.current_day, 1)
+        )
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    model_config = ConfigDict(frozen=True)
 
 
 class DailyCheckInBase(BaseModel):
@@ -121,20 +120,18 @@ class DailyCheckInCreate(DailyCheckInBase):
 
 class DailyCheckIn(DailyCheckInBase):
     """Complete check-in model"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     habit_id: str
     check_in_date: date = Field(default_factory=date.today)
-    created_at: datetime = Field(default_factory=datetime.now)
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            date: lambda v: v.isoformat()
-        }
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class HabitStats(BaseModel):
-    """Statistics for a habit"""
+    """Statistics for a habit
+
+    last_7_days and last_30_days are bitmaps: bit i is set when the habit
+    was completed i days ago (bit 0 is today).
+    """
     habit_id: str
     total_days: int
     completed_days: int
@@ -142,5 +139,19 @@ class HabitStats(BaseModel):
     current_streak: int
     longest_streak: int
     average_completions_per_week: float
-    last_7_days: List[bool]
-    last_30_days: List[bool]
\ No newline at end of file
+    last_7_days: int = Field(0, ge=0, lt=1 << 7, description="Completion bitmap, bit 0 = today")
+    last_30_days: int = Field(0, ge=0, lt=1 << 30, description="Completion bitmap, bit 0 = today")
+
+    @staticmethod
+    def pack_days(days: List[bool]) -> int:
+        """Pack a most-recent-first list of completion flags into a bitmap"""
+        bits = 0
+        for i, completed in enumerate(days):
+            if completed:
+                bits |= 1 << i
+        return bits
+
+    @staticmethod
+    def unpack_days(bits: int, length: int) -> List[bool]:
+        """Expand a bitmap back into a most-recent-first list of flags"""
+        return [bool(bits >> i & 1) for i in range(length)]
\ No newline at end of file
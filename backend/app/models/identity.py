@@ -1,8 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-import uuid
+
+from app.core.ids import uuid7
 
 
 class IdentityStatementBase(BaseModel):
@@ -30,11 +31,13 @@ class IdentityStatementUpdate(BaseModel):
 
 class IdentityStatement(IdentityStatementBase):
     """Complete identity statement model"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     strength: int = Field(0, ge=0, le=100, description="Strength based on supporting habits")
     related_habit_ids: List[str] = Field(default_factory=list)
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    model_config = ConfigDict(frozen=True)
 
 
 class ReminderSettings(BaseModel):
@@ -68,13 +71,8 @@ class IdentitySettingsUpdate(BaseModel):
 
 class IdentitySettings(IdentitySettingsBase):
     """Complete identity settings model"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     user_id: str
     statements: List[IdentityStatement] = Field(default_factory=list, max_items=5)
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
\ No newline at end of file
@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
 from app.models.card import CardStatus
@@ -39,8 +39,8 @@ class CardInDBBase(CardBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    # Read-side schema: instances are never mutated after construction
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class Card(CardInDBBase):
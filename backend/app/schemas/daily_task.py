@@ -1,8 +1,8 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
-from app.models.daily_task import TaskLane, TaskDuration, TaskStatus
+from app.models.enums import TaskLane, TaskDuration, DailyTaskStatus
 
 
 class DailyTaskBase(BaseModel):
@@ -22,7 +22,7 @@ class DailyTaskUpdate(BaseModel):
     description: Optional[str] = None
     lane: Optional[TaskLane] = None
     duration: Optional[TaskDuration] = None
-    status: Optional[TaskStatus] = None
+    status: Optional[DailyTaskStatus] = None
     position: Optional[int] = None
 
 
@@ -30,13 +30,13 @@ class DailyTaskInDBBase(DailyTaskBase):
     id: UUID
     user_id: UUID
     lane: TaskLane
-    status: TaskStatus
+    status: DailyTaskStatus
     created_at: datetime
     updated_at: Optional[datetime]
     completed_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    # Read-side schema: instances are never mutated after construction
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class DailyTask(DailyTaskInDBBase):
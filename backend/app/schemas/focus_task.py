@@ -1,8 +1,8 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime, date
-from app.models.focus_task import TaskLane, TaskStatus
+from app.models.enums import TaskLane, FocusTaskStatus
 
 
 class FocusTaskBase(BaseModel):
@@ -22,7 +22,7 @@ class FocusTaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     lane: Optional[TaskLane] = None
-    status: Optional[TaskStatus] = None
+    status: Optional[FocusTaskStatus] = None
     date: Optional[date] = None
     tags: Optional[List[str]] = None
     position: Optional[int] = None
@@ -31,12 +31,12 @@ class FocusTaskUpdate(BaseModel):
 class FocusTaskInDBBase(FocusTaskBase):
     id: UUID
     card_id: UUID
-    status: TaskStatus
+    status: FocusTaskStatus
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    # Read-side schema: instances are never mutated after construction
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class FocusTask(FocusTaskInDBBase):
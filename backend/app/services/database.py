@@ -1,15 +1,43 @@
+import asyncio
+from collections import defaultdict
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from datetime import datetime
 from app.core.supabase import get_supabase
 from app.models.card import Card, CardStatus
-from app.models.focus_task import FocusTask, TaskLane, TaskStatus as FocusTaskStatus
-from app.models.daily_task import DailyTask, TaskStatus as DailyTaskStatus
+from app.models.focus_task import FocusTask
+from app.models.daily_task import DailyTask
+from app.models.enums import TaskLane, FocusTaskStatus, DailyTaskStatus
 from app.models.user import User
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Column lists for list reads: exactly the fields the list response schemas
+# (app.schemas.*) expose, so PostgREST doesn't ship columns that are dropped
+# on the way out. Single-row detail reads keep select("*").
+LIST_COLS_CARDS = (
+    "id,user_id,title,description,position,status,pause_until,last_worked_on,"
+    "sessions_count,where_left_off,momentum_score,created_at,updated_at"
+)
+LIST_COLS_FOCUS_TASKS = "id,card_id,title,description,lane,status,date,tags,position,created_at,updated_at"
+LIST_COLS_DAILY_TASKS = (
+    "id,user_id,title,description,lane,duration,status,position,created_at,updated_at,completed_at"
+)
+
+async def _execute(query):
+    """Run a PostgREST request on a worker thread; the supabase client is sync and would block the loop"""
+    return await asyncio.to_thread(query.execute)
+
+
+def _paginate(query, offset: int, limit: Optional[int]):
+    """Apply a PostgREST limit/offset window; limit=None returns every row from offset"""
+    if limit is not None:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+    return query
+
+
 class DatabaseService:
     def __init__(self):
         self.client = get_supabase()
@@ -19,7 +47,7 @@ class DatabaseService:
         """Get or create a development user"""
         try:
             # Try to get existing user
-            result = self.client.table("users").select("*").eq("email", email).execute()
+            result = await _execute(self.client.table("users").select("*").eq("email", email))
             if result.data:
                 return result.data[0]
             
@@ -31,179 +59,246 @@ class DatabaseService:
                 "is_active": True,
                 "is_superuser": False
             }
-            result = self.client.table("users").insert(user_data).execute()
+            result = await _execute(self.client.table("users").insert(user_data))
             return result.data[0]
         except Exception as e:
-            logger.error(f"Error in get_or_create_user: {e}")
+            logger.error("Error in get_or_create_user: %s", e, exc_info=True)
             raise
     
     # Card operations
-    async def get_cards(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get all cards for a user"""
+    async def get_cards(self, user_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get cards for a user, optionally one page at a time"""
         try:
-            result = self.client.table("cards").select("*").eq("user_id", user_id).order("position").execute()
+            query = self.client.table("cards").select(LIST_COLS_CARDS).eq("user_id", user_id).order("position")
+            result = await _execute(_paginate(query, offset, limit))
             return result.data
         except Exception as e:
-            logger.error(f"Error getting cards: {e}")
+            logger.error("Error getting cards: %s", e, exc_info=True)
             return []
     
     async def get_card(self, card_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific card"""
         try:
-            result = self.client.table("cards").select("*").eq("id", card_id).eq("user_id", user_id).execute()
+            result = await _execute(self.client.table("cards").select("*").eq("id", card_id).eq("user_id", user_id))
+            return result.data[0] if result.data else None
+        except Exception as e:
+            logger.error("Error getting card: %s", e, exc_info=True)
+            return None
+    
+    async def get_card_with_tasks(self, card_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific card with its focus tasks embedded, in one query"""
+        try:
+            query = (
+                self.client.table("cards")
+                .select(f"*,focus_tasks({LIST_COLS_FOCUS_TASKS})")
+                .eq("id", card_id)
+                .eq("user_id", user_id)
+                .order("position", foreign_table="focus_tasks")
+            )
+            result = await _execute(query)
             return result.data[0] if result.data else None
         except Exception as e:
-            logger.error(f"Error getting card: {e}")
+            logger.error("Error getting card with tasks: %s", e, exc_info=True)
             return None
     
     async def create_card(self, card_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """Create a new card"""
         try:
-            # Ensure only one active card
-            if card_data.get("status") == "active":
-                # Deactivate all other active cards
-                self.client.table("cards").update({"status": "queued"}).eq("user_id", user_id).eq("status", "active").execute()
+            # Insert as queued; activation goes through the atomic RPC so the
+            # one-active-card index never sees two active rows
+            activate = card_data.get("status") == "active"
+            if activate:
+                card_data["status"] = "queued"
             
             card_data["user_id"] = user_id
-            result = self.client.table("cards").insert(card_data).execute()
-            return result.data[0]
+            result = await _execute(self.client.table("cards").insert(card_data))
+            card = result.data[0]
+            
+            if activate:
+                card = await self._set_active_card(card["id"], user_id)
+            return card
         except Exception as e:
-            logger.error(f"Error creating card: {e}")
+            logger.error("Error creating card: %s", e, exc_info=True)
             raise
     
     async def update_card(self, card_id: str, card_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """Update a card"""
         try:
-            # Ensure only one active card
-            if card_data.get("status") == "active":
-                # Deactivate all other active cards except this one
-                self.client.table("cards").update({"status": "queued"}).eq("user_id", user_id).eq("status", "active").neq("id", card_id).execute()
+            activate = card_data.get("status") == "active"
+            if activate:
+                del card_data["status"]
             
-            card_data["updated_at"] = datetime.now().isoformat()
-            result = self.client.table("cards").update(card_data).eq("id", card_id).eq("user_id", user_id).execute()
+            # updated_at is stamped by the update_cards_updated_at trigger
+            if card_data:
+                result = await _execute(self.client.table("cards").update(card_data).eq("id", card_id).eq("user_id", user_id))
+                
+                if not result.data:
+                    raise ValueError(f"Card {card_id} not found")
+                card = result.data[0]
             
-            if not result.data:
-                raise ValueError(f"Card {card_id} not found")
+            if activate:
+                # Deactivate other cards and activate this one in one transaction
+                card = await self._set_active_card(card_id, user_id)
+            elif not card_data:
+                card = await self.get_card(card_id, user_id)
+                if not card:
+                    raise ValueError(f"Card {card_id} not found")
             
-            return result.data[0]
+            return card
         except Exception as e:
-            logger.error(f"Error updating card: {e}")
+            logger.error("Error updating card: %s", e, exc_info=True)
             raise
     
+    async def _set_active_card(self, card_id: str, user_id: str) -> Dict[str, Any]:
+        result = await _execute(self.client.rpc("set_active_card", {"p_user_id": user_id, "p_card_id": card_id}))
+        if not result.data:
+            raise ValueError(f"Card {card_id} not found")
+        return result.data[0]
+    
     async def delete_card(self, card_id: str, user_id: str) -> bool:
         """Delete a card"""
         try:
-            result = self.client.table("cards").delete().eq("id", card_id).eq("user_id", user_id).execute()
+            result = await _execute(self.client.table("cards").delete().eq("id", card_id).eq("user_id", user_id))
             return True
         except Exception as e:
-            logger.error(f"Error deleting card: {e}")
+            logger.error("Error deleting card: %s", e, exc_info=True)
             return False
     
     # Focus Task operations
-    async def get_focus_tasks(self, card_id: Optional[str] = None, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get focus tasks, optionally filtered by card"""
+    async def get_focus_tasks(
+        self,
+        card_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get focus tasks, optionally filtered by card and paginated"""
         try:
-            query = self.client.table("focus_tasks").select("*")
+            query = self.client.table("focus_tasks").select(LIST_COLS_FOCUS_TASKS)
             if card_id:
                 query = query.eq("card_id", card_id)
-            result = query.order("position").execute()
+            result = await _execute(_paginate(query.order("position"), offset, limit))
             return result.data
         except Exception as e:
-            logger.error(f"Error getting focus tasks: {e}")
+            logger.error("Error getting focus tasks: %s", e, exc_info=True)
             return []
     
+    async def get_focus_tasks_for_cards(self, card_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get focus tasks for several cards in one query, grouped by card_id"""
+        grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        if not card_ids:
+            return grouped
+        try:
+            result = await _execute(self.client.table("focus_tasks").select(LIST_COLS_FOCUS_TASKS).in_("card_id", card_ids).order("position"))
+            for task in result.data:
+                grouped[task["card_id"]].append(task)
+            return grouped
+        except Exception as e:
+            logger.error("Error getting focus tasks for cards: %s", e, exc_info=True)
+            return grouped
+    
     async def get_focus_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific focus task"""
         try:
-            result = self.client.table("focus_tasks").select("*").eq("id", task_id).execute()
+            result = await _execute(self.client.table("focus_tasks").select("*").eq("id", task_id))
             return result.data[0] if result.data else None
         except Exception as e:
-            logger.error(f"Error getting focus task: {e}")
+            logger.error("Error getting focus task: %s", e, exc_info=True)
             return None
     
     async def create_focus_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new focus task"""
         try:
-            result = self.client.table("focus_tasks").insert(task_data).execute()
+            result = await _execute(self.client.table("focus_tasks").insert(task_data))
             return result.data[0]
         except Exception as e:
-            logger.error(f"Error creating focus task: {e}")
+            logger.error("Error creating focus task: %s", e, exc_info=True)
             raise
     
     async def update_focus_task(self, task_id: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a focus task"""
         try:
-            task_data["updated_at"] = datetime.now().isoformat()
-            task_data["last_touched"] = datetime.now().isoformat()
-            result = self.client.table("focus_tasks").update(task_data).eq("id", task_id).execute()
+            # updated_at / last_touched are stamped by BEFORE UPDATE triggers
+            if not task_data:
+                task = await self.get_focus_task(task_id)
+                if not task:
+                    raise ValueError(f"Focus task {task_id} not found")
+                return task
+            result = await _execute(self.client.table("focus_tasks").update(task_data).eq("id", task_id))
             
             if not result.data:
                 raise ValueError(f"Focus task {task_id} not found")
             
             return result.data[0]
         except Exception as e:
-            logger.error(f"Error updating focus task: {e}")
+            logger.error("Error updating focus task: %s", e, exc_info=True)
             raise
     
     async def delete_focus_task(self, task_id: str) -> bool:
         """Delete a focus task"""
         try:
-            result = self.client.table("focus_tasks").delete().eq("id", task_id).execute()
+            result = await _execute(self.client.table("focus_tasks").delete().eq("id", task_id))
             return True
         except Exception as e:
-            logger.error(f"Error deleting focus task: {e}")
+            logger.error("Error deleting focus task: %s", e, exc_info=True)
             return False
     
     # Daily Task operations
-    async def get_daily_tasks(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get all daily tasks for a user"""
+    async def get_daily_tasks(self, user_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get daily tasks for a user, optionally one page at a time"""
         try:
-            result = self.client.table("daily_tasks").select("*").eq("user_id", user_id).order("position").execute()
+            query = self.client.table("daily_tasks").select(LIST_COLS_DAILY_TASKS).eq("user_id", user_id).order("position")
+            result = await _execute(_paginate(query, offset, limit))
             return result.data
         except Exception as e:
-            logger.error(f"Error getting daily tasks: {e}")
+            logger.error("Error getting daily tasks: %s", e, exc_info=True)
             return []
     
     async def get_daily_task(self, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific daily task"""
         try:
-            result = self.client.table("daily_tasks").select("*").eq("id", task_id).eq("user_id", user_id).execute()
+            result = await _execute(self.client.table("daily_tasks").select("*").eq("id", task_id).eq("user_id", user_id))
             return result.data[0] if result.data else None
         except Exception as e:
-            logger.error(f"Error getting daily task: {e}")
+            logger.error("Error getting daily task: %s", e, exc_info=True)
             return None
     
     async def create_daily_task(self, task_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """Create a new daily task"""
         try:
             task_data["user_id"] = user_id
-            result = self.client.table("daily_tasks").insert(task_data).execute()
+            result = await _execute(self.client.table("daily_tasks").insert(task_data))
             return result.data[0]
         except Exception as e:
-            logger.error(f"Error creating daily task: {e}")
+            logger.error("Error creating daily task: %s", e, exc_info=True)
             raise
     
     async def update_daily_task(self, task_id: str, task_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """Update a daily task"""
         try:
-            task_data["updated_at"] = datetime.now().isoformat()
-            result = self.client.table("daily_tasks").update(task_data).eq("id", task_id).eq("user_id", user_id).execute()
+            # updated_at is stamped by the update_daily_tasks_updated_at trigger
+            if not task_data:
+                task = await self.get_daily_task(task_id, user_id)
+                if not task:
+                    raise ValueError(f"Daily task {task_id} not found")
+                return task
+            result = await _execute(self.client.table("daily_tasks").update(task_data).eq("id", task_id).eq("user_id", user_id))
             
             if not result.data:
                 raise ValueError(f"Daily task {task_id} not found")
             
             return result.data[0]
         except Exception as e:
-            logger.error(f"Error updating daily task: {e}")
+            logger.error("Error updating daily task: %s", e, exc_info=True)
             raise
     
     async def delete_daily_task(self, task_id: str, user_id: str) -> bool:
         """Delete a daily task"""
         try:
-            result = self.client.table("daily_tasks").delete().eq("id", task_id).eq("user_id", user_id).execute()
+            result = await _execute(self.client.table("daily_tasks").delete().eq("id", task_id).eq("user_id", user_id))
             return True
         except Exception as e:
-            logger.error(f"Error deleting daily task: {e}")
+            logger.error("Error deleting daily task: %s", e, exc_info=True)
             return False
 
 # Singleton instance
@@ -1,22 +1,139 @@
 """
 Email service for sending OTPs
 """
-import random
-import string
-from datetime import datetime, timedelta
-from typing import Optional, Dict
-import smtplib
+import secrets
+import time
+from typing import Optional, Dict, List, Tuple
+import asyncio
+import heapq
+import hmac
+from collections import OrderedDict
+import aiosmtplib
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import os
 
+# Recycle the SMTP connection after this many messages to stay under
+# provider per-connection limits
+MAX_MESSAGES_PER_CONNECTION = 100
+
+# Failed verifications allowed before an OTP is discarded
+MAX_OTP_ATTEMPTS = 3
+
+# Atomically check a candidate code (ARGV[2]) against a Redis-stored OTP.
+# A match deletes the key, so a code verifies only once, and returns 1.
+# A miss counts the attempt and returns 0; once attempts are exhausted the
+# key is deleted. Returns 0 if there is no code.
+_REDIS_OTP_ATTEMPT_SCRIPT = """
+local otp = redis.call('HGET', KEYS[1], 'otp')
+if not otp then return 0 end
+if tonumber(redis.call('HGET', KEYS[1], 'attempts')) >= tonumber(ARGV[1]) then
+    redis.call('DEL', KEYS[1])
+    return 0
+end
+if otp == ARGV[2] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+return 0
+"""
+
+# Background coroutines draining the outgoing OTP email queue
+OTP_SEND_WORKERS = 4
+
+# How long shutdown waits for queued emails to go out
+OTP_SEND_DRAIN_SECONDS = 10
+
+# How often the background task drops expired OTPs
+OTP_SWEEP_INTERVAL_SECONDS = 60
+
+# Hard cap on pending OTPs; the oldest is evicted first when exceeded
+MAX_PENDING_OTPS = 10_000
+
+# Minimum gap between OTP emails to one address, so repeated requests don't
+# each cost an SMTP send
+OTP_RESEND_COOLDOWN_SECONDS = 30
+MAX_RECENT_OTP_EMAILS = 10_000
+
+# HTML bodies; {app_name} is filled in once per service, {otp} per send
+_ACTIVATION_EMAIL_TEMPLATE = """
+        <html>
+            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
+                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px 10px 0 0;">
+                    <h1 style="color: white; margin: 0; text-align: center;">Welcome to {app_name}!</h1>
+                </div>
+                
+                <div style="background: #f7f7f7; padding: 30px; border-radius: 0 0 10px 10px;">
+                    <p style="font-size: 16px; color: #333;">Thank you for signing up! Please activate your account using the code below:</p>
+                    
+                    <div style="background: white; border: 2px solid #667eea; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
+                        <h2 style="color: #667eea; margin: 0; font-size: 32px; letter-spacing: 5px;">{otp}</h2>
+                    </div>
+                    
+                    <p style="font-size: 14px; color: #666;">This code will expire in 10 minutes.</p>
+                    <p style="font-size: 14px; color: #666;">If you didn't request this, please ignore this email.</p>
+                </div>
+                
+                <div style="text-align: center; padding: 20px; color: #999; font-size: 12px;">
+                    <p>© 2024 {app_name}. All rights reserved.</p>
+                </div>
+            </body>
+        </html>
+        """
+
+_LOGIN_EMAIL_TEMPLATE = """
+        <html>
+            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
+                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px 10px 0 0;">
+                    <h1 style="color: white; margin: 0; text-align: center;">{app_name}</h1>
+                </div>
+                
+                <div style="background: #f7f7f7; padding: 30px; border-radius: 0 0 10px 10px;">
+                    <p style="font-size: 16px; color: #333;">Your login code is:</p>
+                    
+                    <div style="background: white; border: 2px solid #667eea; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
+                        <h2 style="color: #667eea; margin: 0; font-size: 32px; letter-spacing: 5px;">{otp}</h2>
+                    </div>
+                    
+                    <p style="font-size: 14px; color: #666;">This code will expire in 10 minutes.</p>
+                    <p style="font-size: 14px; color: #666;">If you didn't request this, please ignore this email.</p>
+                </div>
+                
+                <div style="text-align: center; padding: 20px; color: #999; font-size: 12px;">
+                    <p>© 2024 {app_name}. All rights reserved.</p>
+                </div>
+            </body>
+        </html>
+        """
+
+
+class OTPRecentlySentError(Exception):
+    """A code was already sent to this email within the cooldown window"""
+
+
+def _split_template(template: str, app_name: str) -> Tuple[str, str]:
+    """Bake in the app name and split around the OTP slot"""
+    prefix, suffix = template.replace("{app_name}", app_name).split("{otp}")
+    return prefix, suffix
+
+
 class EmailService:
     """Service for sending emails and managing OTPs"""
     
     def __init__(self):
-        # For development, we'll store OTPs in memory
-        # In production, use Redis or database
-        self.otp_store: Dict[str, Dict] = {}
+        # OTPs live in Redis when REDIS_URL is set (shared across workers,
+        # expiry enforced by Redis); otherwise in memory for development
+        self.redis_url = os.getenv("REDIS_URL")
+        self._redis = None
+        if self.redis_url:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+            self._redis_attempt = self._redis.register_script(_REDIS_OTP_ATTEMPT_SCRIPT)
+        self.otp_store: "OrderedDict[str, Dict]" = OrderedDict()
+        # (expires_at, key) min-heap so expired OTPs can be dropped without
+        # scanning the store; entries for re-issued keys are skipped lazily
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._sweep_task: Optional[asyncio.Task] = None
         
         # Email configuration (you'll need to set these in .env)
         self.smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -25,39 +142,111 @@ class EmailService:
         self.smtp_password = os.getenv("SMTP_PASSWORD", "")
         self.from_email = os.getenv("FROM_EMAIL", "noreply@focuscards.com")
         self.app_name = "Focus Cards"
+        self._activation_prefix, self._activation_suffix = _split_template(_ACTIVATION_EMAIL_TEMPLATE, self.app_name)
+        self._login_prefix, self._login_suffix = _split_template(_LOGIN_EMAIL_TEMPLATE, self.app_name)
         
         # For development, print OTPs to console if email not configured
         self.dev_mode = not self.smtp_user or not self.smtp_password
+        
+        # One authenticated SMTP connection, reused across sends
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._smtp_sent = 0
+        self._smtp_lock = asyncio.Lock()
+        
+        # Outgoing OTP emails, sent by workers started at app startup
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._send_workers: List[asyncio.Task] = []
+        
+        # email -> monotonic time its last code was sent, oldest first
+        # (Redis mode keeps this as an expiring key instead)
+        self._recent_sends: "OrderedDict[str, float]" = OrderedDict()
     
     def generate_otp(self, length: int = 6) -> str:
         """Generate a random OTP"""
-        return ''.join(random.choices(string.digits, k=length))
+        return f"{secrets.randbelow(10 ** length):0{length}d}"
     
-    def store_otp(self, email: str, otp: str, purpose: str = "login", expires_in_minutes: int = 10):
+    async def store_otp(self, email: str, otp: str, purpose: str = "login", expires_in_minutes: int = 10):
         """Store OTP with expiration"""
-        self.otp_store[f"{email}:{purpose}"] = {
+        key = f"{email}:{purpose}"
+        if self._redis is not None:
+            redis_key = f"otp:{key}"
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.delete(redis_key)
+                pipe.hset(redis_key, mapping={"otp": otp, "attempts": 0})
+                pipe.expire(redis_key, expires_in_minutes * 60)
+                await pipe.execute()
+            return
+        
+        # Monotonic deadline: cheap to compare and immune to wall-clock jumps
+        expires_at = time.monotonic() + expires_in_minutes * 60
+        self.otp_store[key] = {
             "otp": otp,
-            "expires_at": datetime.now() + timedelta(minutes=expires_in_minutes),
+            "expires_at": expires_at,
             "attempts": 0,
             "verified": False
         }
+        # Re-issued codes count as newest for eviction
+        self.otp_store.move_to_end(key)
+        while len(self.otp_store) > MAX_PENDING_OTPS:
+            self.otp_store.popitem(last=False)
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+        # Re-issues, verifications and cap evictions leave dead heap entries
+        # behind; rebuild from the live codes before they pile up between sweeps
+        if len(self._expiry_heap) > 2 * len(self.otp_store):
+            self._expiry_heap = [(stored["expires_at"], k) for k, stored in self.otp_store.items()]
+            heapq.heapify(self._expiry_heap)
     
-    def verify_otp(self, email: str, otp: str, purpose: str = "login") -> bool:
+    def sweep_expired_otps(self) -> int:
+        """Drop every expired OTP; returns how many were removed"""
+        now = time.monotonic()
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            stored = self.otp_store.get(key)
+            # Skip heap entries superseded by a newer OTP for the same key
+            if stored is not None and stored["expires_at"] == expires_at:
+                del self.otp_store[key]
+                removed += 1
+        return removed
+    
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(OTP_SWEEP_INTERVAL_SECONDS)
+            self.sweep_expired_otps()
+    
+    def start_otp_sweeper(self):
+        """Start the background expiry sweep (called on app startup)"""
+        # Redis expires its own keys
+        if self._sweep_task is None and self._redis is None:
+            self._sweep_task = asyncio.create_task(self._sweep_periodically())
+    
+    def stop_otp_sweeper(self):
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+    
+    async def verify_otp(self, email: str, otp: str, purpose: str = "login") -> bool:
         """Verify an OTP"""
         key = f"{email}:{purpose}"
         
+        if self._redis is not None:
+            redis_key = f"otp:{key}"
+            matched = await self._redis_attempt(keys=[redis_key], args=[MAX_OTP_ATTEMPTS, otp])
+            return matched == 1
+        
         if key not in self.otp_store:
             return False
         
         stored = self.otp_store[key]
         
         # Check if expired
-        if datetime.now() > stored["expires_at"]:
+        if time.monotonic() > stored["expires_at"]:
             del self.otp_store[key]
             return False
         
-        # Check attempts (max 3)
-        if stored["attempts"] >= 3:
+        # Check attempts
+        if stored["attempts"] >= MAX_OTP_ATTEMPTS:
             del self.otp_store[key]
             return False
         
@@ -65,82 +254,129 @@ class EmailService:
         stored["attempts"] += 1
         
         # Verify OTP
-        if stored["otp"] == otp:
+        if hmac.compare_digest(stored["otp"].encode(), otp.encode()):
             stored["verified"] = True
             return True
         
         return False
     
-    def send_otp_email(self, email: str, purpose: str = "login") -> bool:
-        """Send OTP to email"""
-        otp = self.generate_otp()
-        self.store_otp(email, otp, purpose)
+    async def _claim_send_slot(self, email: str):
+        """Raise OTPRecentlySentError if email got a code within the cooldown, else record this send"""
+        if self._redis is not None:
+            # SET NX is the check and the mark in one step, across workers
+            claimed = await self._redis.set(
+                f"otp-cooldown:{email}", 1, nx=True, ex=OTP_RESEND_COOLDOWN_SECONDS
+            )
+            if not claimed:
+                raise OTPRecentlySentError(
+                    f"OTP already sent; wait {OTP_RESEND_COOLDOWN_SECONDS}s before requesting another"
+                )
+            return
         
-        if purpose == "activation":
-            subject = f"Activate your {self.app_name} account"
-            body = self._get_activation_email_body(otp)
+        now = time.monotonic()
+        recent = self._recent_sends
+        # Entries are in send order, so expired ones are all at the front
+        while recent:
+            oldest_email, sent_at = next(iter(recent.items()))
+            if now - sent_at < OTP_RESEND_COOLDOWN_SECONDS:
+                break
+            del recent[oldest_email]
+        if email in recent:
+            raise OTPRecentlySentError(
+                f"OTP already sent; wait {OTP_RESEND_COOLDOWN_SECONDS}s before requesting another"
+            )
+        recent[email] = now
+        while len(recent) > MAX_RECENT_OTP_EMAILS:
+            recent.popitem(last=False)
+    
+    async def send_otp_email(self, email: str, purpose: str = "login") -> bool:
+        """Send OTP to email; raises OTPRecentlySentError inside the resend cooldown"""
+        await self._claim_send_slot(email)
+        return await self._issue_otp(email, purpose)
+    
+    async def _issue_otp(self, email: str, purpose: str) -> str:
+        otp = self.generate_otp()
+        await self.store_otp(email, otp, purpose)
+        subject, body = self._render_otp_email(otp, purpose)
+        if self._send_queue is not None:
+            # Don't hold the HTTP response for the SMTP round trip
+            self._send_queue.put_nowait((email, subject, body, otp))
         else:
-            subject = f"Your {self.app_name} login code"
-            body = self._get_login_email_body(otp)
-        
-        self._send_email(email, subject, body, otp)
+            await self._send_email(email, subject, body, otp)
         return otp  # Return the OTP for dev mode
     
+    async def _send_worker(self):
+        queue = self._send_queue
+        while True:
+            email, subject, body, otp = await queue.get()
+            try:
+                await self._send_email(email, subject, body, otp)
+            finally:
+                queue.task_done()
+    
+    def start_send_workers(self, count: int = OTP_SEND_WORKERS):
+        """Send OTP emails from a background queue (called on app startup)"""
+        if self._send_queue is None:
+            self._send_queue = asyncio.Queue()
+            self._send_workers = [asyncio.create_task(self._send_worker()) for _ in range(count)]
+    
+    async def stop_send_workers(self):
+        """Give queued emails a chance to go out, then stop the workers"""
+        if self._send_queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._send_queue.join(), OTP_SEND_DRAIN_SECONDS)
+        except asyncio.TimeoutError:
+            print(f"Dropping {self._send_queue.qsize()} unsent OTP emails on shutdown")
+        for task in self._send_workers:
+            task.cancel()
+        self._send_queue = None
+        self._send_workers = []
+    
+    async def send_otp_emails(self, emails: List[str], purpose: str = "login") -> Dict[str, str]:
+        """Issue and send OTPs to several addresses over one SMTP session
+        
+        Returns the OTPs that were issued, keyed by email. The batch stops
+        early once more than a third of the sends have failed; addresses
+        that were never attempted get no OTP.
+        """
+        if self.dev_mode:
+            return {email: await self._issue_otp(email, purpose) for email in emails}
+        
+        issued: Dict[str, str] = {}
+        failures = 0
+        async with self._smtp_lock:
+            for email in emails:
+                otp = self.generate_otp()
+                await self.store_otp(email, otp, purpose)
+                issued[email] = otp
+                subject, body = self._render_otp_email(otp, purpose)
+                try:
+                    await self._deliver(self._build_message(email, subject, body))
+                except Exception as e:
+                    print(f"Failed to send email: {e}")
+                    self._print_fallback(email, otp)
+                    failures += 1
+                    if failures > len(emails) // 3:
+                        print(f"Aborting OTP batch after {failures} failures")
+                        break
+        return issued
+    
+    def _render_otp_email(self, otp: str, purpose: str) -> Tuple[str, str]:
+        """Subject and HTML body for an OTP email"""
+        if purpose == "activation":
+            return f"Activate your {self.app_name} account", self._get_activation_email_body(otp)
+        return f"Your {self.app_name} login code", self._get_login_email_body(otp)
+    
     def _get_activation_email_body(self, otp: str) -> str:
         """Get activation email body"""
-        return f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px 10px 0 0;">
-                    <h1 style="color: white; margin: 0; text-align: center;">Welcome to {self.app_name}!</h1>
-                </div>
-                
-                <div style="background: #f7f7f7; padding: 30px; border-radius: 0 0 10px 10px;">
-                    <p style="font-size: 16px; color: #333;">Thank you for signing up! Please activate your account using the code below:</p>
-                    
-                    <div style="background: white; border: 2px solid #667eea; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
-                        <h2 style="color: #667eea; margin: 0; font-size: 32px; letter-spacing: 5px;">{otp}</h2>
-                    </div>
-                    
-                    <p style="font-size: 14px; color: #666;">This code will expire in 10 minutes.</p>
-                    <p style="font-size: 14px; color: #666;">If you didn't request this, please ignore this email.</p>
-                </div>
-                
-                <div style="text-align: center; padding: 20px; color: #999; font-size: 12px;">
-                    <p>© 2024 {self.app_name}. All rights reserved.</p>
-                </div>
-            </body>
-        </html>
-        """
+        return self._activation_prefix + otp + self._activation_suffix
     
     def _get_login_email_body(self, otp: str) -> str:
         """Get login email body"""
-        return f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px 10px 0 0;">
-                    <h1 style="color: white; margin: 0; text-align: center;">{self.app_name}</h1>
-                </div>
-                
-                <div style="background: #f7f7f7; padding: 30px; border-radius: 0 0 10px 10px;">
-                    <p style="font-size: 16px; color: #333;">Your login code is:</p>
-                    
-                    <div style="background: white; border: 2px solid #667eea; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center;">
-                        <h2 style="color: #667eea; margin: 0; font-size: 32px; letter-spacing: 5px;">{otp}</h2>
-                    </div>
-                    
-                    <p style="font-size: 14px; color: #666;">This code will expire in 10 minutes.</p>
-                    <p style="font-size: 14px; color: #666;">If you didn't request this, please ignore this email.</p>
-                </div>
-                
-                <div style="text-align: center; padding: 20px; color: #999; font-size: 12px;">
-                    <p>© 2024 {self.app_name}. All rights reserved.</p>
-                </div>
-            </body>
-        </html>
-        """
+        return self._login_prefix + otp + self._login_suffix
     
-    def _send_email(self, to_email: str, subject: str, body: str, otp: str) -> bool:
+    async def _send_email(self, to_email: str, subject: str, body: str, otp: str) -> bool:
         """Send email via SMTP or print to console in dev mode"""
         
         if self.dev_mode:
@@ -154,32 +390,79 @@ class EmailService:
             return True
         
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.from_email
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            # Add HTML body
-            html_part = MIMEText(body, 'html')
-            msg.attach(html_part)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            msg = self._build_message(to_email, subject, body)
+            # Send email over the shared connection
+            async with self._smtp_lock:
+                await self._deliver(msg)
             
             return True
         except Exception as e:
             print(f"Failed to send email: {e}")
             # Fallback to console in case of error
-            print("\n" + "="*50)
-            print(f"📧 EMAIL OTP (Fallback)")
-            print(f"To: {to_email}")
-            print(f"OTP Code: {otp}")
-            print("="*50 + "\n")
+            self._print_fallback(to_email, otp)
             return True
+    
+    def _build_message(self, to_email: str, subject: str, body: str) -> MIMEText:
+        # Single-part HTML message; there is no plain-text alternative
+        # to justify a multipart wrapper
+        msg = MIMEText(body, 'html', 'utf-8')
+        msg['From'] = self.from_email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        return msg
+    
+    async def _deliver(self, msg: MIMEText):
+        """Send one message on the shared connection; caller holds _smtp_lock"""
+        server = await self._get_smtp_server()
+        try:
+            await server.send_message(msg)
+        except aiosmtplib.SMTPServerDisconnected:
+            # Dropped between the health check and the send; retry once
+            await self._close_smtp()
+            server = await self._get_smtp_server()
+            await server.send_message(msg)
+        self._smtp_sent += 1
+    
+    def _print_fallback(self, to_email: str, otp: str):
+        print("\n" + "="*50)
+        print(f"📧 EMAIL OTP (Fallback)")
+        print(f"To: {to_email}")
+        print(f"OTP Code: {otp}")
+        print("="*50 + "\n")
+    
+    async def _get_smtp_server(self) -> aiosmtplib.SMTP:
+        """Return the open SMTP connection, reconnecting if it dropped or is due for recycling"""
+        if self._smtp is not None and self._smtp_sent < MAX_MESSAGES_PER_CONNECTION:
+            try:
+                await self._smtp.noop()
+                return self._smtp
+            except (aiosmtplib.SMTPException, OSError):
+                pass
+        
+        await self._close_smtp()
+        server = aiosmtplib.SMTP(hostname=self.smtp_host, port=self.smtp_port, use_tls=False, start_tls=True)
+        await server.connect()
+        await server.login(self.smtp_user, self.smtp_password)
+        self._smtp = server
+        self._smtp_sent = 0
+        return server
+    
+    async def _close_smtp(self):
+        if self._smtp is None:
+            return
+        try:
+            await self._smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            self._smtp.close()
+        finally:
+            self._smtp = None
+    
+    async def aclose(self):
+        """Close the shared SMTP and Redis connections (called on app shutdown)"""
+        async with self._smtp_lock:
+            await self._close_smtp()
+        if self._redis is not None:
+            await self._redis.aclose()
 
 # Global email service instance
 email_service = EmailService()
\ No newline at end of file
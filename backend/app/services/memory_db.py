@@ -1,321 +1,112 @@
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from uuid import UUID, uuid4
-from datetime import datetime
+import time
+from operator import itemgetter
+import bisect
+import os
 import uuid
 
+from app.core.config import settings
+
 # In-memory database
 memory_db = {
     "users": {},
     "cards": {},
     "focus_tasks": {},
-    "daily_tasks": {}
+    "daily_tasks": {},
+    # Secondary indexes over the tables above; rows are shared, not copied.
+    # *_by_user / *_by_card buckets are lists kept sorted by position.
+    "cards_by_user": {},
+    "daily_tasks_by_user": {},
+    "active_card_by_user": {},
+    "focus_tasks_by_card": {},
 }
 
-# Initialize with test data
-def init_test_data():
-    # Create test user
-    user_id = "12345678-1234-5678-1234-567812345678"
-    memory_db["users"][user_id] = {
-        "id": user_id,
-        "email": "dev@example.com",
-        "full_name": "Dev User",
-        "is_active": True,
-        "is_superuser": False,
-        "created_at": datetime.now().isoformat(),
-        "hashed_password": "hashed_password"
-    }
-    
-    # Create test cards
-    card1_id = "596bb074-a0ab-493a-ac91-c664f34bc534"
-    card2_id = "e9dc4c45-aa93-49e2-aafe-dd40745ac0c8"
-    card3_id = "f7a8b9c0-1234-5678-90ab-cdef01234567"
-    
-    memory_db["cards"][card1_id] = {
-        "id": card1_id,
-        "user_id": user_id,
-        "title": "Refactor Authentication System",
-        "description": "Implement OAuth2 with JWT tokens and refresh token rotation",
-        "position": 0,
-        "status": "active",
-        "last_worked_on": "2025-08-26T10:00:00",
-        "sessions_count": 5,
-        "where_left_off": "Working on token refresh logic",
-        "momentum_score": 8,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "pause_until": None
-    }
-    
-    memory_db["cards"][card2_id] = {
-        "id": card2_id,
-        "user_id": user_id,
-        "title": "Build Dashboard Analytics",
-        "description": "Create comprehensive analytics dashboard with charts and KPIs",
-        "position": 1,
-        "status": "queued",
-        "last_worked_on": "2025-08-23T14:00:00",
-        "sessions_count": 2,
-        "where_left_off": "Researching charting libraries",
-        "momentum_score": 3,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "pause_until": None
-    }
-    
-    memory_db["cards"][card3_id] = {
-        "id": card3_id,
-        "user_id": user_id,
-        "title": "API Documentation",
-        "description": "Write comprehensive API documentation with OpenAPI specs",
-        "position": 2,
-        "status": "on-hold",
-        "last_worked_on": "2025-08-18T09:00:00",
-        "sessions_count": 1,
-        "where_left_off": "Outlined main endpoints",
-        "momentum_score": 1,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "pause_until": None
-    }
-    
-    # Create focus tasks for cards
-    tasks = [
-        # Tasks for card1
-        {
-            "id": str(uuid4()),
-            "card_id": card1_id,
-            "title": "Setup JWT structure",
-            "description": "Create JWT token models and validation",
-            "lane": "main",
-            "status": "completed",
-            "position": 0,
-            "is_breakthrough": False,
-            "is_stale": False,
-            "last_touched": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "card_id": card1_id,
-            "title": "Implement refresh tokens",
-            "description": "Add refresh token rotation mechanism",
-            "lane": "main",
-            "status": "active",
-            "position": 1,
-            "is_breakthrough": True,
-            "is_stale": False,
-            "last_touched": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "card_id": card1_id,
-            "title": "Add rate limiting",
-            "description": "Implement rate limiting for auth endpoints",
-            "lane": "main",
-            "position": 2,
-            "status": "pending",
-            "is_breakthrough": False,
-            "is_stale": False,
-            "last_touched": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "card_id": card1_id,
-            "title": "Research OAuth providers",
-            "description": "Evaluate Google, GitHub, Microsoft",
-            "lane": "controller",
-            "status": "pending",
-            "position": 0,
-            "is_breakthrough": False,
-            "is_stale": False,
-            "last_touched": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        },
-        # Tasks for card2
-        {
-            "id": str(uuid4()),
-            "card_id": card2_id,
-            "title": "Design dashboard layout",
-            "description": "Create wireframes and mockups",
-            "lane": "main",
-            "status": "completed",
-            "position": 0,
-            "is_breakthrough": False,
-            "is_stale": False,
-            "last_touched": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "card_id": card2_id,
-            "title": "Implement chart components",
-            "description": "Build reusable chart components",
-            "lane": "main",
-            "status": "pending",
-            "position": 1,
-            "is_breakthrough": True,
-            "is_stale": False,
-            "last_touched": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "card_id": card2_id,
-            "title": "Connect to data source",
-            "description": "Integrate with backend APIs",
-            "lane": "main",
-            "status": "pending",
-            "position": 2,
-            "is_breakthrough": False,
-            "is_stale": False,
-            "last_touched": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "card_id": card2_id,
-            "title": "Research D3.js alternatives",
-            "description": "Compare Chart.js, Recharts, Victory",
-            "lane": "controller",
-            "status": "pending",
-            "position": 0,
-            "is_breakthrough": False,
-            "is_stale": False,
-            "last_touched": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-    ]
-    
-    for task in tasks:
-        memory_db["focus_tasks"][task["id"]] = task
+
+_by_position = itemgetter("position")
+
+
+def _now_ms() -> int:
+    """Current time in epoch milliseconds, the format created_at/updated_at/last_touched are stored in"""
+    return time.time_ns() // 1_000_000
+
+
+def _insort(bucket: List[Dict[str, Any]], row: Dict[str, Any]):
+    bisect.insort(bucket, row, key=_by_position)
+
+
+def _remove_sorted(bucket: List[Dict[str, Any]], row: Dict[str, Any]):
+    """Remove row (by identity) from a position-sorted bucket"""
+    i = bisect.bisect_left(bucket, row["position"], key=_by_position)
+    while bucket[i] is not row:
+        i += 1
+    del bucket[i]
+
+
+def _index_card(card: Dict[str, Any]):
+    _insort(memory_db["cards_by_user"].setdefault(card["user_id"], []), card)
+    if card["status"] == "active":
+        memory_db["active_card_by_user"][card["user_id"]] = card["id"]
+
+
+def _index_focus_task(task: Dict[str, Any]):
+    _insort(memory_db["focus_tasks_by_card"].setdefault(task["card_id"], []), task)
+
+
+def _unindex_focus_task(task: Dict[str, Any]):
+    _remove_sorted(memory_db["focus_tasks_by_card"][task["card_id"]], task)
+
+
+def _index_daily_task(task: Dict[str, Any]):
+    _insort(memory_db["daily_tasks_by_user"].setdefault(task["user_id"], []), task)
+
+
+def _demote_active_card(user_id: str, except_card_id: Optional[str] = None):
+    """Move the user's current active card (if any) back to the queue"""
+    active_id = memory_db["active_card_by_user"].pop(user_id, None)
+    if active_id is not None and active_id != except_card_id:
+        memory_db["cards"][active_id]["status"] = "queued"
+
+
+def _build_indexes():
+    """Rebuild the secondary indexes from the primary tables"""
+    memory_db["cards_by_user"] = {}
+    memory_db["active_card_by_user"] = {}
+    for card in memory_db["cards"].values():
+        _index_card(card)
     
-    # Create sample daily tasks (independent from cards)
-    daily_tasks = [
-        {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "title": "Review inbox and emails",
-            "description": "Check and respond to important emails",
-            "lane": "controller",
-            "duration": None,
-            "status": "pending",
-            "position": 0,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_at": None
-        },
-        {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "title": "Daily standup meeting",
-            "description": "Team sync meeting at 10 AM",
-            "lane": "main",
-            "duration": "15min",
-            "status": "completed",
-            "position": 1,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_at": datetime.now().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "title": "Code review for PR #123",
-            "description": "Review frontend changes",
-            "lane": "main",
-            "duration": "30min",
-            "status": "pending",
-            "position": 2,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_at": None
-        },
-        {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "title": "Update project documentation",
-            "description": "Add new API endpoints to docs",
-            "lane": "main",
-            "duration": "30min",
-            "status": "pending",
-            "position": 3,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_at": None
-        },
-        {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "title": "Coffee break",
-            "description": "Take a quick break",
-            "lane": "main",
-            "duration": "10min",
-            "status": "completed",
-            "position": 4,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_at": datetime.now().isoformat()
-        },
-        {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "title": "Test new deployment pipeline",
-            "description": "Verify CI/CD changes are working",
-            "lane": "controller",
-            "duration": None,
-            "status": "pending",
-            "position": 5,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_at": None
-        },
-        {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "title": "Reply to customer feedback",
-            "description": "Respond to recent support tickets",
-            "lane": "controller",
-            "duration": None,
-            "status": "pending",
-            "position": 6,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_at": None
-        },
-        {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "title": "Research new React patterns",
-            "description": "Look into Server Components",
-            "lane": "controller",
-            "duration": None,
-            "status": "pending",
-            "position": 7,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "completed_at": None
-        }
-    ]
+    memory_db["focus_tasks_by_card"] = {}
+    for task in memory_db["focus_tasks"].values():
+        _index_focus_task(task)
     
-    for task in daily_tasks:
-        memory_db["daily_tasks"][task["id"]] = task
+    memory_db["daily_tasks_by_user"] = {}
+    for task in memory_db["daily_tasks"].values():
+        _index_daily_task(task)
+
+
+def seed_test_data():
+    """Load the development fixtures (called from app startup, not on import)"""
+    if memory_db["users"]:
+        return
+    from app.services.memory_seed import SEED_DATA
+    for table, rows in SEED_DATA.items():
+        memory_db[table].update((row_id, dict(row)) for row_id, row in rows.items())
+    _build_indexes()
 
-# Initialize on module load
-init_test_data()
+
+def should_seed_test_data() -> bool:
+    """Seed in dev mode, or anywhere SEED_TEST_DATA=1 is set"""
+    return settings.DEV_MODE or os.getenv("SEED_TEST_DATA") == "1"
 
 class MemoryDatabaseService:
     """In-memory database service that mimics Supabase structure"""
     
+    def __init__(self):
+        # Per-user serialized list responses, dropped whenever that user's
+        # cards / daily tasks change
+        self._cards_json: Dict[str, bytes] = {}
+        self._daily_tasks_json: Dict[str, bytes] = {}
+    
     # User operations
     async def get_or_create_user(self, email: str = "dev@example.com") -> Dict[str, Any]:
         """Get or create a user"""
@@ -324,6 +115,7 @@ class MemoryDatabaseService:
                 return user
         
         # Create new user
+        now = _now_ms()
         user_id = str(uuid4())
         user = {
             "id": user_id,
@@ -331,8 +123,8 @@ class MemoryDatabaseService:
             "full_name": "New User",
             "is_active": True,
             "is_superuser": False,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "hashed_password": "hashed_password"
         }
         memory_db["users"][user_id] = user
@@ -341,8 +133,14 @@ class MemoryDatabaseService:
     # Card operations
     async def get_cards(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all cards for a user"""
-        cards = [card for card in memory_db["cards"].values() if card["user_id"] == user_id]
-        return sorted(cards, key=lambda x: x["position"])
+        return list(memory_db["cards_by_user"].get(user_id, ()))
+    
+    async def get_cards_json(self, user_id: str, encode: Callable[[List[Dict[str, Any]]], bytes]) -> bytes:
+        """get_cards serialized with encode, cached until the user's cards change"""
+        body = self._cards_json.get(user_id)
+        if body is None:
+            body = self._cards_json[user_id] = encode(await self.get_cards(user_id))
+        return body
     
     async def get_card(self, card_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific card"""
@@ -353,18 +151,17 @@ class MemoryDatabaseService:
     
     async def create_card(self, card_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """Create a new card"""
+        now = _now_ms()
         # Ensure only one active card
         if card_data.get("status") == "active":
-            for card in memory_db["cards"].values():
-                if card["user_id"] == user_id and card["status"] == "active":
-                    card["status"] = "queued"
+            _demote_active_card(user_id)
         
         card_id = str(uuid4())
         card = {
             "id": card_id,
             "user_id": user_id,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "pause_until": None,
             "last_worked_on": None,
             "sessions_count": 0,
@@ -375,6 +172,8 @@ class MemoryDatabaseService:
             **card_data
         }
         memory_db["cards"][card_id] = card
+        _index_card(card)
+        self._cards_json.pop(user_id, None)
         return card
     
     async def update_card(self, card_id: str, card_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -385,22 +184,32 @@ class MemoryDatabaseService:
         
         # Ensure only one active card
         if card_data.get("status") == "active":
-            for other_card in memory_db["cards"].values():
-                if other_card["user_id"] == user_id and other_card["status"] == "active" and other_card["id"] != card_id:
-                    other_card["status"] = "queued"
+            _demote_active_card(user_id, except_card_id=card_id)
+            memory_db["active_card_by_user"][user_id] = card_id
+        elif "status" in card_data and memory_db["active_card_by_user"].get(user_id) == card_id:
+            del memory_db["active_card_by_user"][user_id]
         
+        bucket = memory_db["cards_by_user"][user_id]
+        reposition = "position" in card_data and card_data["position"] != card["position"]
+        if reposition:
+            _remove_sorted(bucket, card)
         card.update(card_data)
-        card["updated_at"] = datetime.now().isoformat()
+        card["updated_at"] = _now_ms()
+        if reposition:
+            _insort(bucket, card)
+        self._cards_json.pop(user_id, None)
         return card
     
     async def delete_card(self, card_id: str, user_id: str) -> bool:
         """Delete a card"""
         if card_id in memory_db["cards"] and memory_db["cards"][card_id]["user_id"] == user_id:
-            del memory_db["cards"][card_id]
+            _remove_sorted(memory_db["cards_by_user"][user_id], memory_db["cards"].pop(card_id))
+            self._cards_json.pop(user_id, None)
+            if memory_db["active_card_by_user"].get(user_id) == card_id:
+                del memory_db["active_card_by_user"][user_id]
             # Also delete associated tasks
-            task_ids_to_delete = [tid for tid, task in memory_db["focus_tasks"].items() if task["card_id"] == card_id]
-            for tid in task_ids_to_delete:
-                del memory_db["focus_tasks"][tid]
+            for task in memory_db["focus_tasks_by_card"].pop(card_id, ()):
+                del memory_db["focus_tasks"][task["id"]]
             return True
         return False
     
@@ -408,10 +217,8 @@ class MemoryDatabaseService:
     async def get_focus_tasks(self, card_id: Optional[str] = None, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get focus tasks, optionally filtered by card"""
         if card_id:
-            tasks = [task for task in memory_db["focus_tasks"].values() if task["card_id"] == card_id]
-        else:
-            tasks = list(memory_db["focus_tasks"].values())
-        return sorted(tasks, key=lambda x: x["position"])
+            return list(memory_db["focus_tasks_by_card"].get(card_id, ()))
+        return sorted(memory_db["focus_tasks"].values(), key=_by_position)
     
     async def get_focus_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific focus task"""
@@ -419,18 +226,20 @@ class MemoryDatabaseService:
     
     async def create_focus_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new focus task"""
+        now = _now_ms()
         task_id = str(uuid4())
         task = {
             "id": task_id,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_touched": datetime.now().isoformat(),
+            "created_at": now,
+            "updated_at": now,
+            "last_touched": now,
             "is_breakthrough": False,
             "is_stale": False,
             "status": "pending",
             **task_data
         }
         memory_db["focus_tasks"][task_id] = task
+        _index_focus_task(task)
         return task
     
     async def update_focus_task(self, task_id: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -439,23 +248,38 @@ class MemoryDatabaseService:
         if not task:
             raise ValueError(f"Focus task {task_id} not found")
         
+        now = _now_ms()
+        reindex = any(
+            field in task_data and task_data[field] != task[field]
+            for field in ("card_id", "position")
+        )
+        if reindex:
+            _unindex_focus_task(task)
         task.update(task_data)
-        task["updated_at"] = datetime.now().isoformat()
-        task["last_touched"] = datetime.now().isoformat()
+        task["updated_at"] = now
+        task["last_touched"] = now
+        if reindex:
+            _index_focus_task(task)
         return task
     
     async def delete_focus_task(self, task_id: str) -> bool:
         """Delete a focus task"""
         if task_id in memory_db["focus_tasks"]:
-            del memory_db["focus_tasks"][task_id]
+            _unindex_focus_task(memory_db["focus_tasks"].pop(task_id))
             return True
         return False
     
     # Daily Task operations (similar structure to focus tasks)
     async def get_daily_tasks(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all daily tasks for a user"""
-        tasks = [task for task in memory_db["daily_tasks"].values() if task.get("user_id") == user_id]
-        return sorted(tasks, key=lambda x: x.get("position", 0))
+        return list(memory_db["daily_tasks_by_user"].get(user_id, ()))
+    
+    async def get_daily_tasks_json(self, user_id: str, encode: Callable[[List[Dict[str, Any]]], bytes]) -> bytes:
+        """get_daily_tasks serialized with encode, cached until the user's daily tasks change"""
+        body = self._daily_tasks_json.get(user_id)
+        if body is None:
+            body = self._daily_tasks_json[user_id] = encode(await self.get_daily_tasks(user_id))
+        return body
     
     async def get_daily_task(self, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific daily task"""
@@ -466,16 +290,19 @@ class MemoryDatabaseService:
     
     async def create_daily_task(self, task_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """Create a new daily task"""
+        now = _now_ms()
         task_id = str(uuid4())
+        # Auto-position at the end of the user's list
+        position = len(memory_db["daily_tasks_by_user"].get(user_id, ()))
         # Set defaults first
         task = {
             "id": task_id,
             "user_id": user_id,
             "status": "pending",  # Default status
             "completed_at": None,  # Default completed_at
-            "position": len([t for t in memory_db["daily_tasks"].values() if t.get("user_id") == user_id]),  # Auto-position
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "position": position,
+            "created_at": now,
+            "updated_at": now,
         }
         # Update with provided data, but don't overwrite defaults if not provided
         for key, value in task_data.items():
@@ -486,6 +313,8 @@ class MemoryDatabaseService:
         if "completed_at" not in task:
             task["completed_at"] = None
         memory_db["daily_tasks"][task_id] = task
+        _index_daily_task(task)
+        self._daily_tasks_json.pop(user_id, None)
         return task
     
     async def update_daily_task(self, task_id: str, task_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
@@ -494,14 +323,22 @@ class MemoryDatabaseService:
         if not task or task.get("user_id") != user_id:
             raise ValueError(f"Daily task {task_id} not found")
         
+        bucket = memory_db["daily_tasks_by_user"][user_id]
+        reposition = "position" in task_data and task_data["position"] != task["position"]
+        if reposition:
+            _remove_sorted(bucket, task)
         task.update(task_data)
-        task["updated_at"] = datetime.now().isoformat()
+        task["updated_at"] = _now_ms()
+        if reposition:
+            _insort(bucket, task)
+        self._daily_tasks_json.pop(user_id, None)
         return task
     
     async def delete_daily_task(self, task_id: str, user_id: str) -> bool:
         """Delete a daily task"""
         if task_id in memory_db["daily_tasks"] and memory_db["daily_tasks"][task_id].get("user_id") == user_id:
-            del memory_db["daily_tasks"][task_id]
+            _remove_sorted(memory_db["daily_tasks_by_user"][user_id], memory_db["daily_tasks"].pop(task_id))
+            self._daily_tasks_json.pop(user_id, None)
             return True
         return False
 
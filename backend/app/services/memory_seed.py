@@ -0,0 +1,282 @@
+"""Development fixtures for the in-memory database, loaded by memory_db.seed_test_data()"""
+
+SEED_DATA = {
+    "users": {
+        "12345678-1234-5678-1234-567812345678": {
+            "id": "12345678-1234-5678-1234-567812345678",
+            "email": "dev@example.com",
+            "full_name": "Dev User",
+            "is_active": True,
+            "is_superuser": False,
+            "created_at": 1756198800000,
+            "hashed_password": "hashed_password",
+        },
+    },
+    "cards": {
+        "596bb074-a0ab-493a-ac91-c664f34bc534": {
+            "id": "596bb074-a0ab-493a-ac91-c664f34bc534",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Refactor Authentication System",
+            "description": "Implement OAuth2 with JWT tokens and refresh token rotation",
+            "position": 0,
+            "status": "active",
+            "last_worked_on": "2025-08-26T10:00:00",
+            "sessions_count": 5,
+            "where_left_off": "Working on token refresh logic",
+            "momentum_score": 8,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "pause_until": None,
+        },
+        "e9dc4c45-aa93-49e2-aafe-dd40745ac0c8": {
+            "id": "e9dc4c45-aa93-49e2-aafe-dd40745ac0c8",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Build Dashboard Analytics",
+            "description": "Create comprehensive analytics dashboard with charts and KPIs",
+            "position": 1,
+            "status": "queued",
+            "last_worked_on": "2025-08-23T14:00:00",
+            "sessions_count": 2,
+            "where_left_off": "Researching charting libraries",
+            "momentum_score": 3,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "pause_until": None,
+        },
+        "f7a8b9c0-1234-5678-90ab-cdef01234567": {
+            "id": "f7a8b9c0-1234-5678-90ab-cdef01234567",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "API Documentation",
+            "description": "Write comprehensive API documentation with OpenAPI specs",
+            "position": 2,
+            "status": "on-hold",
+            "last_worked_on": "2025-08-18T09:00:00",
+            "sessions_count": 1,
+            "where_left_off": "Outlined main endpoints",
+            "momentum_score": 1,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "pause_until": None,
+        },
+    },
+    "focus_tasks": {
+        "b0470e8e-4f06-4bbd-b00a-c245a050b445": {
+            "id": "b0470e8e-4f06-4bbd-b00a-c245a050b445",
+            "card_id": "596bb074-a0ab-493a-ac91-c664f34bc534",
+            "title": "Setup JWT structure",
+            "description": "Create JWT token models and validation",
+            "lane": "main",
+            "status": "completed",
+            "position": 0,
+            "is_breakthrough": False,
+            "is_stale": False,
+            "last_touched": 1756198800000,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+        },
+        "f3fcabfa-028e-42d0-bba8-de8636dd5923": {
+            "id": "f3fcabfa-028e-42d0-bba8-de8636dd5923",
+            "card_id": "596bb074-a0ab-493a-ac91-c664f34bc534",
+            "title": "Implement refresh tokens",
+            "description": "Add refresh token rotation mechanism",
+            "lane": "main",
+            "status": "active",
+            "position": 1,
+            "is_breakthrough": True,
+            "is_stale": False,
+            "last_touched": 1756198800000,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+        },
+        "fa6758f7-6d92-439c-9cd9-a6a2bda8bd08": {
+            "id": "fa6758f7-6d92-439c-9cd9-a6a2bda8bd08",
+            "card_id": "596bb074-a0ab-493a-ac91-c664f34bc534",
+            "title": "Add rate limiting",
+            "description": "Implement rate limiting for auth endpoints",
+            "lane": "main",
+            "position": 2,
+            "status": "pending",
+            "is_breakthrough": False,
+            "is_stale": False,
+            "last_touched": 1756198800000,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+        },
+        "c5e4a17f-3c33-4938-b1cb-db19ef830ad3": {
+            "id": "c5e4a17f-3c33-4938-b1cb-db19ef830ad3",
+            "card_id": "596bb074-a0ab-493a-ac91-c664f34bc534",
+            "title": "Research OAuth providers",
+            "description": "Evaluate Google, GitHub, Microsoft",
+            "lane": "controller",
+            "status": "pending",
+            "position": 0,
+            "is_breakthrough": False,
+            "is_stale": False,
+            "last_touched": 1756198800000,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+        },
+        "e182a29e-209e-492b-94af-a80f667d40f5": {
+            "id": "e182a29e-209e-492b-94af-a80f667d40f5",
+            "card_id": "e9dc4c45-aa93-49e2-aafe-dd40745ac0c8",
+            "title": "Design dashboard layout",
+            "description": "Create wireframes and mockups",
+            "lane": "main",
+            "status": "completed",
+            "position": 0,
+            "is_breakthrough": False,
+            "is_stale": False,
+            "last_touched": 1756198800000,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+        },
+        "cd1b4806-09c0-49ae-860e-058b9016fa6b": {
+            "id": "cd1b4806-09c0-49ae-860e-058b9016fa6b",
+            "card_id": "e9dc4c45-aa93-49e2-aafe-dd40745ac0c8",
+            "title": "Implement chart components",
+            "description": "Build reusable chart components",
+            "lane": "main",
+            "status": "pending",
+            "position": 1,
+            "is_breakthrough": True,
+            "is_stale": False,
+            "last_touched": 1756198800000,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+        },
+        "cb7a1480-4d53-4a6e-ad0e-a3b4651baaa8": {
+            "id": "cb7a1480-4d53-4a6e-ad0e-a3b4651baaa8",
+            "card_id": "e9dc4c45-aa93-49e2-aafe-dd40745ac0c8",
+            "title": "Connect to data source",
+            "description": "Integrate with backend APIs",
+            "lane": "main",
+            "status": "pending",
+            "position": 2,
+            "is_breakthrough": False,
+            "is_stale": False,
+            "last_touched": 1756198800000,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+        },
+        "049f3aa5-477c-43ea-a886-c9db0293347a": {
+            "id": "049f3aa5-477c-43ea-a886-c9db0293347a",
+            "card_id": "e9dc4c45-aa93-49e2-aafe-dd40745ac0c8",
+            "title": "Research D3.js alternatives",
+            "description": "Compare Chart.js, Recharts, Victory",
+            "lane": "controller",
+            "status": "pending",
+            "position": 0,
+            "is_breakthrough": False,
+            "is_stale": False,
+            "last_touched": 1756198800000,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+        },
+    },
+    "daily_tasks": {
+        "d1c0c62f-2589-481e-8dc4-1d5c02047737": {
+            "id": "d1c0c62f-2589-481e-8dc4-1d5c02047737",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Review inbox and emails",
+            "description": "Check and respond to important emails",
+            "lane": "controller",
+            "duration": None,
+            "status": "pending",
+            "position": 0,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "completed_at": None,
+        },
+        "7816ebbe-0c2a-4af0-989a-0884faba75f7": {
+            "id": "7816ebbe-0c2a-4af0-989a-0884faba75f7",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Daily standup meeting",
+            "description": "Team sync meeting at 10 AM",
+            "lane": "main",
+            "duration": "15min",
+            "status": "completed",
+            "position": 1,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "completed_at": "2025-08-26T09:00:00",
+        },
+        "c3fdb83f-be18-4e64-b322-5e199a131807": {
+            "id": "c3fdb83f-be18-4e64-b322-5e199a131807",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Code review for PR #123",
+            "description": "Review frontend changes",
+            "lane": "main",
+            "duration": "30min",
+            "status": "pending",
+            "position": 2,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "completed_at": None,
+        },
+        "ac348ae5-105f-4c89-9ece-5c476fe1b482": {
+            "id": "ac348ae5-105f-4c89-9ece-5c476fe1b482",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Update project documentation",
+            "description": "Add new API endpoints to docs",
+            "lane": "main",
+            "duration": "30min",
+            "status": "pending",
+            "position": 3,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "completed_at": None,
+        },
+        "96ae1342-8b4d-4004-a27f-f8b22203a18b": {
+            "id": "96ae1342-8b4d-4004-a27f-f8b22203a18b",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Coffee break",
+            "description": "Take a quick break",
+            "lane": "main",
+            "duration": "10min",
+            "status": "completed",
+            "position": 4,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "completed_at": "2025-08-26T09:00:00",
+        },
+        "47326557-bd58-4423-90bf-7191fe66b72d": {
+            "id": "47326557-bd58-4423-90bf-7191fe66b72d",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Test new deployment pipeline",
+            "description": "Verify CI/CD changes are working",
+            "lane": "controller",
+            "duration": None,
+            "status": "pending",
+            "position": 5,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "completed_at": None,
+        },
+        "f4dd5207-ee5c-496c-b993-888868fafded": {
+            "id": "f4dd5207-ee5c-496c-b993-888868fafded",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Reply to customer feedback",
+            "description": "Respond to recent support tickets",
+            "lane": "controller",
+            "duration": None,
+            "status": "pending",
+            "position": 6,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "completed_at": None,
+        },
+        "9badb1af-45ae-48e0-b4b9-18319b4d3eb5": {
+            "id": "9badb1af-45ae-48e0-b4b9-18319b4d3eb5",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "title": "Research new React patterns",
+            "description": "Look into Server Components",
+            "lane": "controller",
+            "duration": None,
+            "status": "pending",
+            "position": 7,
+            "created_at": 1756198800000,
+            "updated_at": 1756198800000,
+            "completed_at": None,
+        },
+    },
+}
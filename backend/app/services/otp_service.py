@@ -1,39 +1,116 @@
 """
 OTP Service for authentication
 """
+import asyncio
 import secrets
 import string
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
 import hashlib
 import httpx
+import orjson
 from app.core.config import settings
 from app.services.supabase_client import supabase_service
 
+_sha256 = hashlib.sha256
+_UTC = timezone.utc
+
+OTP_STORE_TIMEOUT_SECONDS = 5.0
+SEND_RETRY_ATTEMPTS = 3
+SEND_RETRY_BASE_DELAY = 0.5
+
+AUTH_CODE_PURGE_INTERVAL_SECONDS = 300
+AUTH_CODE_RETENTION = timedelta(hours=1)
+# pg advisory lock key so only one worker runs each purge
+AUTH_CODE_PURGE_LOCK_KEY = 42
+
+# Strong refs to in-flight background sends; the loop only keeps weak ones
+_pending: Set[asyncio.Task] = set()
+
+# One pooled client for every Resend call so OTP sends reuse the keep-alive
+# connection instead of paying DNS + TLS per email; closed on app shutdown
+_resend_client: Optional[httpx.AsyncClient] = None
+if settings.RESEND_API_KEY:
+    _resend_client = httpx.AsyncClient(
+        base_url="https://api.resend.com",
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        headers={
+            "Authorization": f"Bearer {settings.RESEND_API_KEY}",
+            "Content-Type": "application/json"
+        }
+    )
+
+
+async def close_resend_client() -> None:
+    """Close the shared Resend HTTP client"""
+    if _resend_client is not None:
+        await _resend_client.aclose()
+
+
+# Login email body; ${minutes} is filled once below, leaving only ${otp} per send
+_OTP_EMAIL_TMPL = string.Template("""
+<div style="font-family: sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2>Your Login Code</h2>
+    <p>Use this code to log in to your account:</p>
+    <div style="background: #f4f4f4; padding: 20px; text-align: center; font-size: 32px; font-weight: bold; letter-spacing: 5px; margin: 20px 0;">
+        ${otp}
+    </div>
+    <p>This code will expire in ${minutes} minutes.</p>
+    <p style="color: #666; font-size: 14px;">If you didn't request this code, please ignore this email.</p>
+</div>
+""")
+
+# Fields shared by every login email; per-send fields are merged in
+_BASE_PAYLOAD = {
+    "from": settings.EMAIL_FROM or "noreply@yourdomain.com",
+    "subject": "Your Login Code"
+}
+
 
 class OTPService:
     OTP_LENGTH = 6
     OTP_EXPIRY_MINUTES = 10
     MAX_ATTEMPTS = 3
+    _OTP_MOD = 10 ** OTP_LENGTH
+    _OTP_FMT = f"{{:0{OTP_LENGTH}d}}"
+    
+    def __init__(self):
+        self._purge_task: Optional[asyncio.Task] = None
     
     @staticmethod
     def generate_otp() -> str:
         """Generate a random 6-digit OTP"""
-        return ''.join(secrets.choice(string.digits) for _ in range(OTPService.OTP_LENGTH))
+        return OTPService._OTP_FMT.format(secrets.randbelow(OTPService._OTP_MOD))
     
     @staticmethod
-    def hash_otp(otp: str) -> str:
-        """Hash the OTP for secure storage"""
-        return hashlib.sha256(otp.encode()).hexdigest()
+    def hash_otp(otp: str) -> bytes:
+        """Hash the OTP for secure storage (raw 32-byte digest, stored as bytea)"""
+        return _sha256(otp.encode("ascii")).digest()
     
     async def create_otp(self, email: str) -> str:
         """Create and store OTP for email"""
         otp = self.generate_otp()
         hashed_otp = self.hash_otp(otp)
-        expires_at = datetime.utcnow() + timedelta(minutes=self.OTP_EXPIRY_MINUTES)
+        now = datetime.now(_UTC)
+        expires_at = now + timedelta(minutes=self.OTP_EXPIRY_MINUTES)
         
-        # Store in auth_codes table
-        result = await supabase_service.execute_query(
+        await self._store_otp(email, hashed_otp, expires_at, now)
+        
+        return otp
+    
+    async def issue_otp(self, email: str) -> str:
+        """Create and store an OTP, then email it in the background"""
+        # Only a stored code is sent: a failed or timed-out INSERT raises
+        # here, before the user gets a code that could never verify
+        otp = await asyncio.wait_for(self.create_otp(email), OTP_STORE_TIMEOUT_SECONDS)
+        self.send_otp_email_bg(email, otp)
+        return otp
+    
+    async def _store_otp(self, email: str, hashed_otp: bytes, expires_at: datetime, created_at: datetime) -> None:
+        """Upsert the email's code in auth_codes, resetting attempts"""
+        await supabase_service.execute_query(
             """
             INSERT INTO auth_codes (email, code_hash, expires_at, created_at)
             VALUES ($1, $2, $3, $4)
@@ -45,95 +122,99 @@ class OTPService:
                 used_at = NULL,
                 attempts = 0
             """,
-            email, hashed_otp, expires_at, datetime.utcnow()
+            email, hashed_otp, expires_at, created_at
         )
-        
-        return otp
     
     async def verify_otp(self, email: str, otp: str) -> bool:
         """Verify OTP for email"""
+        if not otp.isascii():
+            return False
         hashed_otp = self.hash_otp(otp)
         
-        # Check OTP validity
+        # Count the attempt and consume the code in one statement: only a live
+        # row is touched, and used_at is set only when the hash matches
         result = await supabase_service.execute_query(
             """
-            SELECT code_hash, expires_at, attempts, used_at
-            FROM auth_codes
+            UPDATE auth_codes
+            SET attempts = attempts + 1,
+                used_at = CASE WHEN code_hash = $4 THEN $2 ELSE used_at END
             WHERE email = $1
             AND expires_at > $2
             AND used_at IS NULL
             AND attempts < $3
+            RETURNING used_at IS NOT NULL AS ok
             """,
-            email, datetime.utcnow(), self.MAX_ATTEMPTS
+            email, datetime.now(_UTC), self.MAX_ATTEMPTS, hashed_otp
         )
         
         if not result or not result.data:
             return False
         
-        auth_code = result.data[0]
-        
-        # Increment attempts
-        await supabase_service.execute_query(
-            """
-            UPDATE auth_codes
-            SET attempts = attempts + 1
-            WHERE email = $1
-            """,
-            email
-        )
-        
-        # Verify hash
-        if auth_code['code_hash'] != hashed_otp:
-            return False
-        
-        # Mark as used
-        await supabase_service.execute_query(
-            """
-            UPDATE auth_codes
-            SET used_at = $1
-            WHERE email = $2
-            """,
-            datetime.utcnow(), email
+        return bool(result.data[0]['ok'])
+    
+    async def purge_stale_codes(self) -> None:
+        """Delete consumed codes and codes expired past the retention window"""
+        before = (datetime.now(_UTC) - AUTH_CODE_RETENTION).isoformat()
+        # supabase-py is sync; run the RPC on a worker thread
+        await asyncio.to_thread(
+            supabase_service.client.rpc(
+                "purge_auth_codes",
+                {"p_before": before, "p_lock_key": AUTH_CODE_PURGE_LOCK_KEY}
+            ).execute
         )
-        
-        return True
+    
+    async def _purge_periodically(self):
+        while True:
+            await asyncio.sleep(AUTH_CODE_PURGE_INTERVAL_SECONDS)
+            try:
+                await self.purge_stale_codes()
+            except Exception as e:
+                print(f"Failed to purge auth codes: {e}")
+    
+    def start_code_purger(self):
+        """Start the background auth_codes purge (called on app startup)"""
+        if self._purge_task is None:
+            self._purge_task = asyncio.create_task(self._purge_periodically())
+    
+    def stop_code_purger(self):
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            self._purge_task = None
     
     async def send_otp_email(self, email: str, otp: str) -> bool:
         """Send OTP via email using Resend API"""
-        if not settings.RESEND_API_KEY:
+        if _resend_client is None:
             # For development, just log the OTP
             print(f"OTP for {email}: {otp}")
             return True
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.resend.com/emails",
-                    json={
-                        "from": settings.EMAIL_FROM or "noreply@yourdomain.com",
-                        "to": email,
-                        "subject": "Your Login Code",
-                        "html": f"""
-                        <div style="font-family: sans-serif; max-width: 600px; margin: 0 auto;">
-                            <h2>Your Login Code</h2>
-                            <p>Use this code to log in to your account:</p>
-                            <div style="background: #f4f4f4; padding: 20px; text-align: center; font-size: 32px; font-weight: bold; letter-spacing: 5px; margin: 20px 0;">
-                                {otp}
-                            </div>
-                            <p>This code will expire in {self.OTP_EXPIRY_MINUTES} minutes.</p>
-                            <p style="color: #666; font-size: 14px;">If you didn't request this code, please ignore this email.</p>
-                        </div>
-                        """
-                    },
-                    headers={
-                        "Authorization": f"Bearer {settings.RESEND_API_KEY}",
-                        "Content-Type": "application/json"
-                    }
-                )
-                return response.status_code == 200
+            payload = {**_BASE_PAYLOAD, "to": email, "html": _OTP_EMAIL_HTML.substitute(otp=otp)}
+            # Content-Type is set on the shared client
+            response = await _resend_client.post("/emails", content=orjson.dumps(payload))
+            return response.status_code == 200
         except Exception as e:
             print(f"Failed to send email: {e}")
             return False
+    
+    async def _send_with_retry(self, email: str, otp: str) -> bool:
+        """Send the OTP email, retrying with exponential backoff"""
+        for attempt in range(SEND_RETRY_ATTEMPTS):
+            if await self.send_otp_email(email, otp):
+                return True
+            if attempt + 1 < SEND_RETRY_ATTEMPTS:
+                await asyncio.sleep(SEND_RETRY_BASE_DELAY * 2 ** attempt)
+        print(f"Giving up on OTP email to {email} after {SEND_RETRY_ATTEMPTS} attempts")
+        return False
+    
+    def send_otp_email_bg(self, email: str, otp: str) -> asyncio.Task:
+        """Send the OTP email in the background so the request can return immediately"""
+        task = asyncio.create_task(self._send_with_retry(email, otp))
+        _pending.add(task)
+        task.add_done_callback(_pending.discard)
+        return task
+
 
+_OTP_EMAIL_HTML = string.Template(_OTP_EMAIL_TMPL.safe_substitute(minutes=OTPService.OTP_EXPIRY_MINUTES))
 
 otp_service = OTPService()
\ No newline at end of file
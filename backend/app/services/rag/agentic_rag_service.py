@@ -1,13 +1,27 @@
 """Advanced Agentic RAG Service for Personalized Guidance"""
 
 import os
-import json
+import asyncio
+import atexit
+import hashlib
+import heapq
 import logging
-from typing import List, Dict, Any, Optional, Union
+import math
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from operator import itemgetter
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple, Union
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import numpy as np
+import orjson
 from llama_index.core import (
     VectorStoreIndex, 
     Document, 
@@ -18,9 +32,11 @@ from llama_index.core import (
 from llama_index.vector_stores.chroma import ChromaVectorStore
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.query_engine import RetrieverQueryEngine
-from llama_index.core.postprocessor import SimilarityPostprocessor
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
 import chromadb
-from .gemini_client import GeminiRAGClient
+from chromadb.utils import embedding_functions
+from .gemini_client import GeminiRAGClient, parse_fenced_json
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +50,66 @@ class GuidanceType(Enum):
     PATTERN_ANALYSIS = "pattern_analysis"
 
 
-@dataclass
+# Knowledge-base search terms per guidance type
+_TYPE_QUERIES = {
+    GuidanceType.DAILY_WISDOM: "daily wisdom inspiration motivation",
+    GuidanceType.HABIT_OPTIMIZATION: "habit formation behavior change discipline",
+    GuidanceType.MANIFESTATION_INSIGHT: "manifestation visualization subconscious programming",
+    GuidanceType.SUCCESS_PREDICTION: "success patterns achievement goal attainment",
+    GuidanceType.CUSTOM_AFFIRMATION: "affirmations positive thinking self-talk",
+    GuidanceType.PATTERN_ANALYSIS: "behavior patterns self-awareness growth"
+}
+
+@lru_cache(maxsize=1024)
+def _build_knowledge_query_cached(guidance_type: GuidanceType,
+                                  goals: Tuple[str, ...],
+                                  dominant_trait: Optional[str],
+                                  specific_query: Optional[str]) -> str:
+    query_parts = [_TYPE_QUERIES.get(guidance_type, "personal development")]
+    
+    # Add user context
+    if goals:
+        query_parts.append(f"goals: {' '.join(goals)}")
+    
+    # Add dominant personality trait
+    if dominant_trait is not None:
+        query_parts.append(f"personality: {dominant_trait}")
+    
+    # Add specific query if provided
+    if specific_query:
+        query_parts.append(specific_query)
+    
+    return " ".join(query_parts)
+
+
+# Section and list-item detection for _extract_action_items
+_ACTION_RE = re.compile(r'\b(action|step|do|practice)\b', re.IGNORECASE)
+_FOLLOWUP_RE = re.compile(r'\b(follow|next|consider|explore)\b', re.IGNORECASE)
+_BULLET_RE = re.compile(r'^\s*(?:\d+[.)-]|[-•])\s*(.*)')
+
+# Knowledge retrieval casts a wide net, then keeps only the few nodes that
+# clear a score threshold derived from the candidates themselves
+RETRIEVAL_TOP_K = 20
+PROMPT_CONTEXT_K = 3
+
+# Documents parsed and inserted per insert_nodes call when extending the index
+INGEST_BATCH_SIZE = 100
+
+# Worker threads for blocking Chroma, LlamaIndex and Gemini calls
+IO_POOL_WORKERS = 8
+
+# Profile updates between writes of the user-pattern arrays to disk
+PATTERN_FLUSH_EVERY = 16
+
+# Guidance types bundled into provide_daily_insights
+DAILY_INSIGHT_TYPES = (
+    GuidanceType.DAILY_WISDOM,
+    GuidanceType.HABIT_OPTIMIZATION,
+    GuidanceType.PATTERN_ANALYSIS
+)
+
+
+@dataclass(slots=True, eq=False)
 class UserProfile:
     user_id: str
     goals: List[str]
@@ -44,9 +119,11 @@ class UserProfile:
     success_patterns: Dict[str, Any]
     learning_preferences: Dict[str, Any]
     last_updated: datetime
+    # Top 3 (trait, score) pairs, filled by AgenticRAGService.update_user_profile
+    _top_traits: List[Tuple[str, float]] = field(default_factory=list, init=False, repr=False)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class GuidanceRequest:
     user_profile: UserProfile
     guidance_type: GuidanceType
@@ -55,7 +132,7 @@ class GuidanceRequest:
     urgency: str = "normal"  # low, normal, high
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class GuidanceResponse:
     guidance_text: str
     confidence: float
@@ -66,6 +143,164 @@ class GuidanceResponse:
     metadata: Dict[str, Any]
 
 
+# (epoch second, ISO string) of the last formatted timestamp
+_ts_cache: Tuple[float, str] = (0.0, "")
+
+
+def _iso_now() -> str:
+    """Local ISO-8601 timestamp, formatted at most once per wall-clock second"""
+    global _ts_cache
+    t = time.time()
+    if t - _ts_cache[0] >= 1.0:
+        _ts_cache = (t, datetime.fromtimestamp(t).isoformat())
+    return _ts_cache[1]
+
+
+def _quantize_int8(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Symmetric per-vector int8 quantization; vector ~= q * scale"""
+    max_abs = float(np.abs(vector).max()) if vector.size else 0.0
+    scale = max_abs / 127 if max_abs else 1.0
+    return np.round(vector / scale).astype(np.int8), scale
+
+
+def _rerank_nodes(nodes: List[Any], keep: int = PROMPT_CONTEXT_K) -> List[Any]:
+    """Keep the best nodes scoring at least mean - 0.5 * std of the candidate scores"""
+    if not nodes:
+        return []
+    scores = np.array([node.score if node.score is not None else 0.0 for node in nodes], dtype=np.float32)
+    threshold = scores.mean() - 0.5 * scores.std()
+    order = np.argsort(-scores, kind="stable")
+    return [nodes[i] for i in order[:keep] if scores[i] >= threshold]
+
+
+async def _single_chunk(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+class GuidanceCache:
+    """Thread-safe LRU cache with per-entry TTL for generated guidance"""
+    
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, GuidanceResponse]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Tuple) -> Optional[GuidanceResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: Tuple, response: GuidanceResponse):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate_user(self, user_id: str):
+        """Drop every entry for a user; keys lead with the user_id"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+_COACH_PREAMBLE = (
+    "You are an advanced AI coach specializing in personalized guidance based on "
+    "the wisdom of Napoleon Hill, Joseph Murphy, and Al-Ghazali."
+)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache persisted next to the Chroma data.
+    
+    Keys are (namespace, sha256(text)); the namespace keeps vectors from
+    different embedding models apart.
+    """
+    
+    FLUSH_EVERY = 32
+    
+    def __init__(self, path: str, max_entries: int = 50_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], np.ndarray] = {}
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self._load()
+    
+    @staticmethod
+    def _key(namespace: str, text: str) -> Tuple[str, str]:
+        return namespace, hashlib.sha256(text.encode()).hexdigest()
+    
+    def get(self, namespace: str, text: str) -> Optional[np.ndarray]:
+        with self._lock:
+            return self._entries.get(self._key(namespace, text))
+    
+    def put(self, namespace: str, text: str, embedding: np.ndarray):
+        with self._lock:
+            self._entries[self._key(namespace, text)] = embedding
+            # Dicts keep insertion order, so the first key is the oldest
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._dirty += 1
+            if self._dirty >= self.FLUSH_EVERY:
+                self.flush()
+    
+    def discard(self, namespace: str, text: str):
+        with self._lock:
+            if self._entries.pop(self._key(namespace, text), None) is not None:
+                self._dirty += 1
+    
+    def flush(self):
+        """Write the cache to disk if anything changed since the last flush"""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(self._entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.path)
+                self._dirty = 0
+            except OSError as e:
+                logger.error(f"Error saving embedding cache: {e}")
+    
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                self._entries = pickle.load(f)
+        except Exception as e:
+            logger.error(f"Error loading embedding cache, starting empty: {e}")
+            self._entries = {}
+
+
 class AgenticRAGService:
     """
     Advanced RAG service that provides personalized guidance based on:
@@ -86,7 +321,14 @@ class AgenticRAGService:
             gemini_api_key: Google Gemini API key
         """
         self.chroma_persist_dir = chroma_persist_dir
-        self.gemini_client = GeminiRAGClient(gemini_api_key)
+        self.gemini_client = GeminiRAGClient(
+            gemini_api_key,
+            cache_path=os.path.join(chroma_persist_dir, "semantic_cache.pkl")
+        )
+        
+        # Bounded pool for the sync clients, so concurrent requests can't
+        # exhaust the loop's default executor
+        self._io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="rag-io")
         
         # Initialize ChromaDB
         self.chroma_client = chromadb.PersistentClient(path=chroma_persist_dir)
@@ -103,27 +345,66 @@ class AgenticRAGService:
         self.index = None
         self.query_engine = None
         
+        # similarity_top_k -> retriever over self.index
+        self._retriever_cache: Dict[int, VectorIndexRetriever] = {}
+        
         # User profiles cache
         self.user_profiles: Dict[str, UserProfile] = {}
         
+        # user_id -> (last_updated, serialized patterns)
+        self._serialized_cache: Dict[str, Tuple[datetime, str]] = {}
+        
+        # Generated guidance, keyed by user, type, query and profile content
+        self.guidance_cache = GuidanceCache()
+        
+        # User patterns live in-process as structure-of-arrays: one L2-normalized
+        # row per user, int8-quantized with a per-row scale (grown by doubling),
+        # plus parallel id/doc/metadata lists, persisted as user_patterns.npy,
+        # user_patterns_scales.npy and user_patterns.json. Similar-user lookup
+        # is an integer matrix-vector product instead of a Chroma query.
+        # Embedded with Chroma's default model, the one the collection used.
+        self._pattern_embedder = embedding_functions.DefaultEmbeddingFunction()
+        os.makedirs(chroma_persist_dir, exist_ok=True)
+        self.embedding_cache = EmbeddingCache(os.path.join(chroma_persist_dir, "embedding_cache.pkl"))
+        self._pattern_vectors_path = os.path.join(chroma_persist_dir, "user_patterns.npy")
+        self._pattern_scales_path = os.path.join(chroma_persist_dir, "user_patterns_scales.npy")
+        self._pattern_meta_path = os.path.join(chroma_persist_dir, "user_patterns.json")
+        self._pattern_vectors = np.zeros((0, 0), dtype=np.int8)
+        self._pattern_scales = np.zeros(0, dtype=np.float32)
+        self._pattern_count = 0
+        self._pattern_user_ids: List[str] = []
+        self._pattern_docs: List[str] = []
+        self._pattern_metadatas: List[Dict[str, Any]] = []
+        self._pattern_index: Dict[str, int] = {}
+        self._pattern_dirty = 0
+        self._load_user_patterns()
+        
+        # Pattern updates are flushed every PATTERN_FLUSH_EVERY writes; make
+        # sure the tail isn't lost when the process exits
+        atexit.register(self.close)
+        
         logger.info("Agentic RAG Service initialized")
     
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the I/O pool without stalling the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, partial(func, *args))
+    
     def _get_or_create_collection(self, name: str):
         """Get or create a ChromaDB collection"""
-        try:
-            return self.chroma_client.get_collection(name)
-        except:
-            return self.chroma_client.create_collection(name)
+        return self.chroma_client.get_or_create_collection(name)
     
-    def ingest_knowledge_documents(self, documents: List[Dict[str, str]]):
+    def ingest_knowledge_documents(self, documents: List[Dict[str, Any]]):
         """
         Ingest spiritual and psychological knowledge documents
         
         Args:
-            documents: List of documents with 'text', 'title', 'author', 'source' keys
+            documents: List of documents with 'text', 'title', 'author', 'source' keys,
+                and optionally a precomputed 'embedding' of the text
         """
         logger.info(f"Ingesting {len(documents)} knowledge documents")
         
+        # One stamp for the whole batch
+        ingestion_date = _iso_now()
         llama_docs = []
         for doc_data in documents:
             doc = Document(
@@ -133,38 +414,51 @@ class AgenticRAGService:
                     "author": doc_data.get("author", "Unknown"),
                     "source": doc_data.get("source", "Unknown"),
                     "document_type": "knowledge",
-                    "ingestion_date": datetime.now().isoformat()
-                }
+                    "ingestion_date": ingestion_date
+                },
+                embedding=doc_data.get("embedding")
             )
             llama_docs.append(doc)
         
         # Create or update index
         if self.index is None:
-            self.index = VectorStoreIndex.from_documents(
-                llama_docs, 
-                storage_context=self.storage_context
-            )
-        else:
-            for doc in llama_docs:
-                self.index.insert(doc)
-        
-        # Create query engine
-        retriever = VectorIndexRetriever(
-            index=self.index,
-            similarity_top_k=5
-        )
-        
-        self.query_engine = RetrieverQueryEngine(
-            retriever=retriever,
-            postprocessors=[SimilarityPostprocessor(similarity_cutoff=0.7)]
-        )
+            self.index = VectorStoreIndex([], storage_context=self.storage_context)
+        
+        # Bulk insert so embeddings and the Chroma add are batched rather than
+        # one round-trip per document. Pre-embedded documents go in as single
+        # nodes to keep their vectors; the rest are chunked and embedded here.
+        for start in range(0, len(llama_docs), INGEST_BATCH_SIZE):
+            batch = llama_docs[start:start + INGEST_BATCH_SIZE]
+            nodes = [doc for doc in batch if doc.embedding is not None]
+            unembedded = [doc for doc in batch if doc.embedding is None]
+            if unembedded:
+                nodes.extend(Settings.node_parser.get_nodes_from_documents(unembedded))
+            self.index.insert_nodes(nodes)
+        
+        # Inserts land in the same index, so the engine is only built once
+        if self.query_engine is None:
+            self.query_engine = RetrieverQueryEngine(retriever=self._get_retriever(RETRIEVAL_TOP_K))
         
         logger.info("Knowledge documents ingested successfully")
     
+    def _get_retriever(self, similarity_top_k: int) -> VectorIndexRetriever:
+        """Retriever over the knowledge index for a given top-k, built once per k"""
+        retriever = self._retriever_cache.get(similarity_top_k)
+        if retriever is None:
+            retriever = VectorIndexRetriever(index=self.index, similarity_top_k=similarity_top_k)
+            self._retriever_cache[similarity_top_k] = retriever
+        return retriever
+    
     def update_user_profile(self, user_profile: UserProfile):
         """Update user profile in memory and persistent storage"""
+        previous = self.user_profiles.get(user_profile.user_id)
+        if previous is not None:
+            self.embedding_cache.discard("pattern", self._serialize_user_patterns(previous))
+        
         user_profile.last_updated = datetime.now()
+        user_profile._top_traits = heapq.nlargest(3, user_profile.personality_traits.items(), key=itemgetter(1))
         self.user_profiles[user_profile.user_id] = user_profile
+        self.guidance_cache.invalidate_user(user_profile.user_id)
         
         # Store user patterns for learning
         self._store_user_patterns(user_profile)
@@ -172,21 +466,163 @@ class AgenticRAGService:
     def _store_user_patterns(self, user_profile: UserProfile):
         """Store user patterns in vector database for similarity matching"""
         pattern_text = self._serialize_user_patterns(user_profile)
+        embedding = self._embed_pattern(pattern_text)
+        metadata = {
+            "user_id": user_profile.user_id,
+            "goals": orjson.dumps(user_profile.goals).decode(),
+            "trait_dominant": self._top_traits(user_profile)[0][0],
+            "last_updated": user_profile.last_updated.isoformat()
+        }
         
-        # Store in ChromaDB for user pattern matching
-        self.user_patterns_collection.upsert(
-            documents=[pattern_text],
-            metadatas=[{
-                "user_id": user_profile.user_id,
-                "goals": json.dumps(user_profile.goals),
-                "trait_dominant": max(user_profile.personality_traits.items(), key=lambda x: x[1])[0],
-                "last_updated": user_profile.last_updated.isoformat()
-            }],
-            ids=[f"user_pattern_{user_profile.user_id}"]
-        )
+        self._set_pattern_row(user_profile.user_id, embedding, pattern_text, metadata)
+        self._pattern_dirty += 1
+        if self._pattern_dirty >= PATTERN_FLUSH_EVERY:
+            self.flush_user_patterns()
+    
+    def _embed_pattern(self, text: str) -> np.ndarray:
+        embedding = self.embedding_cache.get("pattern", text)
+        if embedding is None:
+            embedding = np.asarray(self._pattern_embedder([text])[0], dtype=np.float32)
+            self.embedding_cache.put("pattern", text, embedding)
+        return embedding
+    
+    def _embed_query(self, query: str) -> List[float]:
+        """Gemini query embedding for knowledge retrieval, cached by text"""
+        embedding = self.embedding_cache.get("query", query)
+        if embedding is None:
+            embedding = np.asarray(self.gemini_client.embed_model.get_query_embedding(query), dtype=np.float32)
+            self.embedding_cache.put("query", query, embedding)
+        return embedding.tolist()
+    
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Query embeddings for several texts in one worker hop"""
+        return [self._embed_query(query) for query in queries]
+    
+    def _load_user_patterns(self):
+        """Load the pattern arrays from disk, migrating from the Chroma collection on first run"""
+        try:
+            if os.path.exists(self._pattern_vectors_path) and os.path.exists(self._pattern_meta_path):
+                vectors = np.load(self._pattern_vectors_path)
+                with open(self._pattern_meta_path, "rb") as f:
+                    meta = orjson.loads(f.read())
+                if vectors.dtype == np.int8 and os.path.exists(self._pattern_scales_path):
+                    self._pattern_vectors = vectors
+                    self._pattern_scales = np.load(self._pattern_scales_path).astype(np.float32, copy=False)
+                else:
+                    # float32 arrays from before quantization; rows are already normalized
+                    quantized = [_quantize_int8(row) for row in vectors.astype(np.float32, copy=False)]
+                    self._pattern_vectors = np.array([q for q, _ in quantized], dtype=np.int8).reshape(vectors.shape)
+                    self._pattern_scales = np.array([scale for _, scale in quantized], dtype=np.float32)
+                    self._pattern_dirty += 1
+                if len(meta["user_ids"]) != len(vectors) or len(self._pattern_scales) != len(vectors):
+                    raise ValueError(
+                        f"pattern files disagree: {len(vectors)} vectors, "
+                        f"{len(self._pattern_scales)} scales, {len(meta['user_ids'])} users"
+                    )
+                self._pattern_count = len(meta["user_ids"])
+                self._pattern_user_ids = meta["user_ids"]
+                self._pattern_docs = meta["documents"]
+                self._pattern_metadatas = meta["metadatas"]
+                self._pattern_index = {user_id: i for i, user_id in enumerate(self._pattern_user_ids)}
+                return
+            
+            stored = self.user_patterns_collection.get(include=["embeddings", "documents", "metadatas"])
+        except Exception as e:
+            logger.error(f"Error loading user patterns: {e}")
+            self._pattern_vectors = np.zeros((0, 0), dtype=np.int8)
+            self._pattern_scales = np.zeros(0, dtype=np.float32)
+            return
+        for embedding, doc, metadata in zip(stored["embeddings"] or [], stored["documents"] or [], stored["metadatas"] or []):
+            self._set_pattern_row(metadata["user_id"], np.asarray(embedding, dtype=np.float32), doc, metadata)
+        if self._pattern_count:
+            self._pattern_dirty += 1
+            self.flush_user_patterns()
+    
+    def flush_user_patterns(self):
+        """Persist the pattern arrays if they changed since the last flush"""
+        if not self._pattern_dirty:
+            return
+        count = self._pattern_count
+        meta = orjson.dumps({
+            "user_ids": self._pattern_user_ids,
+            "documents": self._pattern_docs,
+            "metadatas": self._pattern_metadatas
+        })
+        # Write every file to a temp path before replacing any, so a crash
+        # never leaves a truncated file; the loader checks the row counts agree
+        writes = [
+            (self._pattern_vectors_path, lambda f: np.save(f, self._pattern_vectors[:count])),
+            (self._pattern_scales_path, lambda f: np.save(f, self._pattern_scales[:count])),
+            (self._pattern_meta_path, lambda f: f.write(meta))
+        ]
+        try:
+            for path, write in writes:
+                with open(f"{path}.tmp", "wb") as f:
+                    write(f)
+            for path, _ in writes:
+                os.replace(f"{path}.tmp", path)
+            self._pattern_dirty = 0
+        except OSError as e:
+            logger.error(f"Error saving user patterns: {e}")
+    
+    def close(self):
+        """Flush the pattern arrays and on-disk caches and stop the I/O pool"""
+        self.flush_user_patterns()
+        self.embedding_cache.flush()
+        self.gemini_client.response_cache.flush()
+        self._io_pool.shutdown(wait=True)
+    
+    def _set_pattern_row(self, user_id: str, embedding: np.ndarray, doc: str, metadata: Dict[str, Any]):
+        norm = np.linalg.norm(embedding)
+        row, scale = _quantize_int8(embedding / norm if norm else embedding)
+        
+        idx = self._pattern_index.get(user_id)
+        if idx is None:
+            if self._pattern_vectors.shape[1] != row.shape[0]:
+                # First row (or a new embedding size): start a fresh buffer
+                self._pattern_vectors = np.zeros((16, row.shape[0]), dtype=np.int8)
+                self._pattern_scales = np.zeros(16, dtype=np.float32)
+                self._pattern_count = 0
+                self._pattern_user_ids, self._pattern_docs, self._pattern_metadatas = [], [], []
+                self._pattern_index = {}
+            elif self._pattern_count == self._pattern_vectors.shape[0]:
+                capacity = max(16, self._pattern_count * 2)
+                grown = np.zeros((capacity, row.shape[0]), dtype=np.int8)
+                grown[:self._pattern_count] = self._pattern_vectors
+                self._pattern_vectors = grown
+                grown_scales = np.zeros(capacity, dtype=np.float32)
+                grown_scales[:self._pattern_count] = self._pattern_scales
+                self._pattern_scales = grown_scales
+            idx = self._pattern_count
+            self._pattern_count += 1
+            self._pattern_index[user_id] = idx
+            self._pattern_user_ids.append(user_id)
+            self._pattern_docs.append(doc)
+            self._pattern_metadatas.append(metadata)
+        else:
+            self._pattern_docs[idx] = doc
+            self._pattern_metadatas[idx] = metadata
+        self._pattern_vectors[idx] = row
+        self._pattern_scales[idx] = scale
+    
+    @staticmethod
+    def _top_traits(user_profile: UserProfile) -> List[Tuple[str, float]]:
+        """Top 3 personality traits, precomputed on update when available"""
+        if user_profile._top_traits or not user_profile.personality_traits:
+            return user_profile._top_traits
+        return heapq.nlargest(3, user_profile.personality_traits.items(), key=itemgetter(1))
     
     def _serialize_user_patterns(self, user_profile: UserProfile) -> str:
-        """Convert user profile to searchable text"""
+        """Convert user profile to searchable text, memoized per profile version"""
+        cached = self._serialized_cache.get(user_profile.user_id)
+        if cached is not None and cached[0] == user_profile.last_updated:
+            return cached[1]
+        
+        text = self._build_user_patterns_text(user_profile)
+        self._serialized_cache[user_profile.user_id] = (user_profile.last_updated, text)
+        return text
+    
+    def _build_user_patterns_text(self, user_profile: UserProfile) -> str:
         patterns = []
         
         # Goals
@@ -205,7 +641,7 @@ class AgenticRAGService:
         patterns.append(f"Manifestation targets: {', '.join(manifestation_descriptions)}")
         
         # Personality traits
-        top_traits = sorted(user_profile.personality_traits.items(), key=lambda x: x[1], reverse=True)[:3]
+        top_traits = self._top_traits(user_profile)
         patterns.append(f"Top personality traits: {', '.join([f'{trait}: {score:.2f}' for trait, score in top_traits])}")
         
         return "\n".join(patterns)
@@ -214,43 +650,85 @@ class AgenticRAGService:
         """
         Generate personalized guidance based on user profile and request type
         """
-        logger.info(f"Generating {request.guidance_type.value} guidance for user {request.user_profile.user_id}")
+        cache_key = self._guidance_cache_key(request)
+        cached = self.guidance_cache.get(cache_key)
+        if cached is not None:
+            self._record_interaction(request, cached)
+            return cached
         
-        # Find similar users for pattern matching
-        similar_patterns = self._find_similar_user_patterns(request.user_profile)
+        logger.info(f"Generating {request.guidance_type.value} guidance for user {request.user_profile.user_id}")
         
-        # Retrieve relevant knowledge
-        knowledge_context = await self._retrieve_relevant_knowledge(request)
+        # Similar-user matching and knowledge retrieval are independent lookups
+        similar_patterns, knowledge_context = await asyncio.gather(
+            self._find_similar_user_patterns(request.user_profile),
+            self._retrieve_relevant_knowledge(request)
+        )
         
         # Generate personalized guidance
         guidance_response = await self._generate_guidance(request, knowledge_context, similar_patterns)
         
+        # Don't pin the apology response from a failed generation
+        if "error" not in guidance_response.metadata:
+            self.guidance_cache.put(cache_key, guidance_response)
+        
         # Learn from the interaction
         self._record_interaction(request, guidance_response)
         
         return guidance_response
     
-    def _find_similar_user_patterns(self, user_profile: UserProfile, top_k: int = 3) -> List[Dict[str, Any]]:
+    def _guidance_cache_key(self, request: GuidanceRequest) -> Tuple[str, str, str, str]:
+        """Cache key for a guidance request; the profile digest makes edits miss"""
+        profile_digest = hashlib.blake2b(
+            self._serialize_user_patterns(request.user_profile).encode(),
+            digest_size=16
+        ).hexdigest()
+        return (
+            request.user_profile.user_id,
+            request.guidance_type.value,
+            request.specific_query or "",
+            profile_digest
+        )
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters for the guidance cache"""
+        return self.guidance_cache.stats()
+    
+    async def _find_similar_user_patterns(self, user_profile: UserProfile, top_k: int = 3) -> List[Dict[str, Any]]:
         """Find similar user patterns for collaborative insights"""
-        query_text = self._serialize_user_patterns(user_profile)
-        
         try:
-            results = self.user_patterns_collection.query(
-                query_texts=[query_text],
-                n_results=top_k + 1,  # +1 to exclude self
-                include=["documents", "metadatas"]
-            )
+            self_idx = self._pattern_index.get(user_profile.user_id)
+            if self_idx is not None:
+                # The user's own stored row is already the query vector
+                query_vec = self._pattern_vectors[self_idx]
+                query_scale = self._pattern_scales[self_idx]
+            else:
+                embedding = await self._run_blocking(self._embed_pattern, self._serialize_user_patterns(user_profile))
+                norm = np.linalg.norm(embedding)
+                query_vec, query_scale = _quantize_int8(embedding / norm if norm else embedding)
+            
+            if not self._pattern_count or query_vec.shape[0] != self._pattern_vectors.shape[1]:
+                return []
+            
+            # Rows are unit length before quantization, so the rescaled integer
+            # dot product approximates the cosine similarity
+            n = self._pattern_count
+            scores = np.matmul(self._pattern_vectors[:n], query_vec, dtype=np.int32) * self._pattern_scales[:n] * query_scale
+            if self_idx is not None:
+                scores[self_idx] = -np.inf
+            
+            k = min(top_k, len(scores) - (self_idx is not None))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
             
             similar_patterns = []
-            for i, (doc, metadata) in enumerate(zip(results["documents"][0], results["metadatas"][0])):
-                # Skip self
-                if metadata["user_id"] == user_profile.user_id:
-                    continue
-                
+            for i in top:
+                metadata = self._pattern_metadatas[i]
                 similar_patterns.append({
                     "user_id": metadata["user_id"],
-                    "patterns": doc,
-                    "goals": json.loads(metadata["goals"]),
+                    "patterns": self._pattern_docs[i],
+                    "goals": orjson.loads(metadata["goals"]),
                     "dominant_trait": metadata["trait_dominant"]
                 })
             
@@ -265,56 +743,74 @@ class AgenticRAGService:
             return []
         
         # Build query based on request type and user profile
-        query = self._build_knowledge_query(request)
+        return await self._query_knowledge(self._build_knowledge_query(request))
+    
+    async def _query_knowledge(self, query: str) -> List[Dict[str, Any]]:
+        """Run a query against the knowledge base"""
+        if not self.query_engine:
+            return []
         
         try:
-            response = self.query_engine.query(query)
-            
-            knowledge_context = []
-            for node in response.source_nodes:
-                knowledge_context.append({
-                    "text": node.get_content(),
-                    "metadata": node.metadata,
-                    "score": node.score if hasattr(node, 'score') else 1.0
-                })
-            
-            return knowledge_context
+            # Pre-embedded bundle so the retriever skips its own embedding call.
+            # Only the source nodes are used, so retrieve without synthesis.
+            bundle = QueryBundle(query_str=query, embedding=await self._run_blocking(self._embed_query, query))
+            nodes = await self._run_blocking(self._get_retriever(RETRIEVAL_TOP_K).retrieve, bundle)
+            return self._nodes_to_context(nodes)
         except Exception as e:
             logger.error(f"Error retrieving knowledge: {e}")
             return []
     
+    async def _retrieve_relevant_knowledge_batch(self, requests: List[GuidanceRequest]) -> List[List[Dict[str, Any]]]:
+        """Retrieve knowledge for several requests with one Chroma query; results in request order"""
+        if not self.query_engine or not requests:
+            return [[] for _ in requests]
+        
+        try:
+            queries = [self._build_knowledge_query(r) for r in requests]
+            embeddings = await self._run_blocking(self._embed_queries, queries)
+            results = await self._run_blocking(partial(
+                self.knowledge_collection.query,
+                query_embeddings=embeddings,
+                n_results=RETRIEVAL_TOP_K,
+                include=["documents", "metadatas", "distances"]
+            ))
+            
+            batch = []
+            for docs, metadatas, distances in zip(results["documents"], results["metadatas"], results["distances"]):
+                # Same distance-to-similarity conversion ChromaVectorStore applies
+                nodes = [
+                    NodeWithScore(node=metadata_dict_to_node(metadata, text=doc), score=math.exp(-distance))
+                    for doc, metadata, distance in zip(docs, metadatas, distances)
+                ]
+                batch.append(self._nodes_to_context(nodes))
+            return batch
+        except Exception as e:
+            logger.error(f"Error retrieving knowledge batch: {e}")
+            return [[] for _ in requests]
+    
+    @staticmethod
+    def _nodes_to_context(nodes: List[NodeWithScore]) -> List[Dict[str, Any]]:
+        """Reranked retrieval results as prompt context dicts"""
+        return [
+            {
+                "text": node.get_content(),
+                "metadata": node.metadata,
+                "score": node.score if node.score is not None else 1.0
+            }
+            for node in _rerank_nodes(nodes)
+        ]
+    
     def _build_knowledge_query(self, request: GuidanceRequest) -> str:
         """Build an optimized query for knowledge retrieval"""
         user_profile = request.user_profile
+        top_traits = self._top_traits(user_profile)
         
-        query_parts = []
-        
-        # Base query based on guidance type
-        type_queries = {
-            GuidanceType.DAILY_WISDOM: "daily wisdom inspiration motivation",
-            GuidanceType.HABIT_OPTIMIZATION: "habit formation behavior change discipline",
-            GuidanceType.MANIFESTATION_INSIGHT: "manifestation visualization subconscious programming",
-            GuidanceType.SUCCESS_PREDICTION: "success patterns achievement goal attainment",
-            GuidanceType.CUSTOM_AFFIRMATION: "affirmations positive thinking self-talk",
-            GuidanceType.PATTERN_ANALYSIS: "behavior patterns self-awareness growth"
-        }
-        
-        query_parts.append(type_queries.get(request.guidance_type, "personal development"))
-        
-        # Add user context
-        if user_profile.goals:
-            query_parts.append(f"goals: {' '.join(user_profile.goals[:3])}")
-        
-        # Add dominant personality trait
-        if user_profile.personality_traits:
-            dominant_trait = max(user_profile.personality_traits.items(), key=lambda x: x[1])[0]
-            query_parts.append(f"personality: {dominant_trait}")
-        
-        # Add specific query if provided
-        if request.specific_query:
-            query_parts.append(request.specific_query)
-        
-        return " ".join(query_parts)
+        return _build_knowledge_query_cached(
+            request.guidance_type,
+            tuple(user_profile.goals[:3]),
+            top_traits[0][0] if top_traits else None,
+            request.specific_query
+        )
     
     async def _generate_guidance(self, 
                                request: GuidanceRequest, 
@@ -327,42 +823,8 @@ class AgenticRAGService:
         
         try:
             # Generate guidance
-            guidance_text = self.gemini_client.complete(prompt)
-            
-            # Extract actionable steps and follow-up suggestions
-            actionable_steps, follow_up_suggestions = self._extract_action_items(guidance_text)
-            
-            # Calculate personalization score
-            personalization_score = self._calculate_personalization_score(
-                request.user_profile, knowledge_context, similar_patterns
-            )
-            
-            # Prepare sources
-            sources = [
-                {
-                    "title": ctx["metadata"].get("title", "Unknown"),
-                    "author": ctx["metadata"].get("author", "Unknown"),
-                    "source": ctx["metadata"].get("source", "Unknown")
-                }
-                for ctx in knowledge_context
-            ]
-            
-            return GuidanceResponse(
-                guidance_text=guidance_text,
-                confidence=0.85,  # This could be calculated based on retrieval scores
-                sources=sources,
-                actionable_steps=actionable_steps,
-                follow_up_suggestions=follow_up_suggestions,
-                personalization_score=personalization_score,
-                metadata={
-                    "guidance_type": request.guidance_type.value,
-                    "user_id": request.user_profile.user_id,
-                    "generated_at": datetime.now().isoformat(),
-                    "similar_patterns_found": len(similar_patterns),
-                    "knowledge_sources_used": len(knowledge_context)
-                }
-            )
-            
+            guidance_text = await self._run_blocking(self.gemini_client.complete, prompt)
+            return self._build_guidance_response(request, guidance_text, knowledge_context, similar_patterns)
         except Exception as e:
             logger.error(f"Error generating guidance: {e}")
             return GuidanceResponse(
@@ -375,71 +837,213 @@ class AgenticRAGService:
                 metadata={"error": str(e)}
             )
     
+    def _build_guidance_response(self,
+                                 request: GuidanceRequest,
+                                 guidance_text: str,
+                                 knowledge_context: List[Dict[str, Any]],
+                                 similar_patterns: List[Dict[str, Any]]) -> GuidanceResponse:
+        """Wrap generated text with its action items, sources and scores"""
+        # Extract actionable steps and follow-up suggestions
+        actionable_steps, follow_up_suggestions = self._extract_action_items(guidance_text)
+        
+        # Calculate personalization score
+        personalization_score = self._calculate_personalization_score(
+            request.user_profile, knowledge_context, similar_patterns
+        )
+        
+        # Prepare sources
+        sources = [
+            {
+                "title": ctx["metadata"].get("title", "Unknown"),
+                "author": ctx["metadata"].get("author", "Unknown"),
+                "source": ctx["metadata"].get("source", "Unknown")
+            }
+            for ctx in knowledge_context
+        ]
+        
+        return GuidanceResponse(
+            guidance_text=guidance_text,
+            confidence=0.85,  # This could be calculated based on retrieval scores
+            sources=sources,
+            actionable_steps=actionable_steps,
+            follow_up_suggestions=follow_up_suggestions,
+            personalization_score=personalization_score,
+            metadata={
+                "guidance_type": request.guidance_type.value,
+                "user_id": request.user_profile.user_id,
+                "generated_at": _iso_now(),
+                "similar_patterns_found": len(similar_patterns),
+                "knowledge_sources_used": len(knowledge_context)
+            }
+        )
+    
+    async def stream_personalized_guidance(
+        self, request: GuidanceRequest
+    ) -> Tuple[GuidanceResponse, AsyncIterator[str]]:
+        """
+        Generate personalized guidance as a stream of text chunks
+        
+        Returns (response, chunks). chunks yields text as Gemini produces it;
+        the response's guidance_text, actionable_steps and follow_up_suggestions
+        are filled in once chunks has been fully consumed.
+        """
+        cache_key = self._guidance_cache_key(request)
+        cached = self.guidance_cache.get(cache_key)
+        if cached is not None:
+            self._record_interaction(request, cached)
+            return cached, _single_chunk(cached.guidance_text)
+        
+        similar_patterns, knowledge_context = await asyncio.gather(
+            self._find_similar_user_patterns(request.user_profile),
+            self._retrieve_relevant_knowledge(request)
+        )
+        
+        prompt = self._build_guidance_prompt(request, knowledge_context, similar_patterns)
+        response = self._build_guidance_response(request, "", knowledge_context, similar_patterns)
+        return response, self._stream_guidance_text(prompt, request, response, cache_key)
+    
+    async def _stream_guidance_text(self,
+                                    prompt: str,
+                                    request: GuidanceRequest,
+                                    response: GuidanceResponse,
+                                    cache_key: Tuple) -> AsyncIterator[str]:
+        chunks = []
+        try:
+            completion = self.gemini_client.stream_complete(prompt)
+            while True:
+                # Each chunk read blocks on the network, so pull it on a worker thread
+                chunk = await self._run_blocking(next, completion, None)
+                if chunk is None:
+                    break
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error streaming guidance: {e}")
+            response.confidence = 0.0
+            response.metadata["error"] = str(e)
+            if not chunks:
+                chunks.append("I apologize, but I'm unable to generate personalized guidance at this moment. Please try again later.")
+                yield chunks[0]
+        
+        response.guidance_text = "".join(chunks)
+        response.actionable_steps, response.follow_up_suggestions = self._extract_action_items(response.guidance_text)
+        if "error" not in response.metadata:
+            self.guidance_cache.put(cache_key, response)
+        self._record_interaction(request, response)
+    
     def _build_guidance_prompt(self, 
                              request: GuidanceRequest,
                              knowledge_context: List[Dict[str, Any]],
                              similar_patterns: List[Dict[str, Any]]) -> str:
         """Build a comprehensive prompt for guidance generation"""
         
-        user_profile = request.user_profile
-        
         prompt_parts = [
-            "You are an advanced AI coach specializing in personalized guidance based on the wisdom of Napoleon Hill, Joseph Murphy, and Al-Ghazali.",
+            _COACH_PREAMBLE,
             "",
             f"GUIDANCE TYPE: {request.guidance_type.value}",
             "",
             "USER PROFILE:",
         ]
+        self._write_profile_lines(prompt_parts, request.user_profile)
+        
+        # Specific query
+        if request.specific_query:
+            prompt_parts.append("Specific Question: %s" % request.specific_query)
         
+        self._write_context_lines(prompt_parts, knowledge_context, similar_patterns)
+        
+        prompt_parts.extend([
+            "",
+            "Please provide:",
+            "1. Personalized guidance that combines insights from the three masters",
+            "2. 3-5 specific, actionable steps",
+            "3. 2-3 follow-up questions or suggestions",
+            "",
+            "Make the guidance deeply personal, practical, and inspiring.",
+            "Format your response with clear sections for guidance, action steps, and follow-up suggestions."
+        ])
+        
+        return "\n".join(prompt_parts)
+    
+    def _write_profile_lines(self, buf: List[str], user_profile: UserProfile):
+        """Append the USER PROFILE section shared by the single and multi-type prompts to buf"""
         # User goals
         if user_profile.goals:
-            prompt_parts.append(f"Goals: {', '.join(user_profile.goals)}")
+            buf.append("Goals: %s" % ", ".join(user_profile.goals))
         
-        # Current habits
+        # Current habits (top 5)
         if user_profile.current_habits:
-            habits_desc = []
-            for habit in user_profile.current_habits[:5]:  # Top 5 habits
-                habits_desc.append(f"- {habit.get('name', 'habit')}: {habit.get('status', 'active')}")
-            prompt_parts.append(f"Current Habits:\n" + "\n".join(habits_desc))
+            buf.append("Current Habits:")
+            buf.extend(
+                "- %s: %s" % (habit.get('name', 'habit'), habit.get('status', 'active'))
+                for habit in islice(user_profile.current_habits, 5)
+            )
         
-        # Manifestation targets
+        # Manifestation targets (top 3)
         if user_profile.manifestation_targets:
-            targets_desc = []
-            for target in user_profile.manifestation_targets[:3]:  # Top 3 targets
-                targets_desc.append(f"- {target.get('description', 'goal')}: {target.get('timeline', 'ongoing')}")
-            prompt_parts.append(f"Manifestation Targets:\n" + "\n".join(targets_desc))
+            buf.append("Manifestation Targets:")
+            buf.extend(
+                "- %s: %s" % (target.get('description', 'goal'), target.get('timeline', 'ongoing'))
+                for target in islice(user_profile.manifestation_targets, 3)
+            )
         
         # Personality traits
         if user_profile.personality_traits:
-            top_traits = sorted(user_profile.personality_traits.items(), key=lambda x: x[1], reverse=True)[:3]
-            traits_desc = [f"{trait}: {score:.2f}" for trait, score in top_traits]
-            prompt_parts.append(f"Top Personality Traits: {', '.join(traits_desc)}")
-        
-        # Specific query
-        if request.specific_query:
-            prompt_parts.append(f"Specific Question: {request.specific_query}")
-        
-        # Knowledge context
+            buf.append("Top Personality Traits: %s" % ", ".join(
+                "%s: %.2f" % pair for pair in self._top_traits(user_profile)
+            ))
+    
+    def _write_context_lines(self,
+                             buf: List[str],
+                             knowledge_context: List[Dict[str, Any]],
+                             similar_patterns: List[Dict[str, Any]]):
+        """Append retrieved knowledge and similar-user lines for a prompt to buf"""
+        # Knowledge context (top 3 most relevant)
         if knowledge_context:
-            prompt_parts.append("\nRELEVANT KNOWLEDGE:")
-            for ctx in knowledge_context[:3]:  # Top 3 most relevant
-                prompt_parts.append(f"From {ctx['metadata'].get('author', 'Unknown')}: {ctx['text'][:200]}...")
+            buf.append("\nRELEVANT KNOWLEDGE:")
+            buf.extend(
+                "From %s: %s..." % (ctx['metadata'].get('author', 'Unknown'), ctx['text'][:200])
+                for ctx in islice(knowledge_context, 3)
+            )
         
-        # Similar user patterns
+        # Similar user patterns (top 2)
         if similar_patterns:
-            prompt_parts.append("\nSIMILAR USER PATTERNS:")
-            for pattern in similar_patterns[:2]:  # Top 2 similar patterns
-                prompt_parts.append(f"Similar user goals: {', '.join(pattern['goals'][:3])}")
+            buf.append("\nSIMILAR USER PATTERNS:")
+            buf.extend(
+                "Similar user goals: %s" % ", ".join(islice(pattern['goals'], 3))
+                for pattern in islice(similar_patterns, 2)
+            )
+    
+    def _build_multi_guidance_prompt(self,
+                                     user_profile: UserProfile,
+                                     guidance_types: Tuple[GuidanceType, ...],
+                                     knowledge_context: List[Dict[str, Any]],
+                                     similar_patterns: List[Dict[str, Any]]) -> str:
+        """Build one prompt asking for several guidance types as a JSON object"""
+        prompt_parts = [
+            _COACH_PREAMBLE,
+            "",
+            f"GUIDANCE TYPES: {', '.join(t.value for t in guidance_types)}",
+            "",
+            "USER PROFILE:",
+        ]
+        self._write_profile_lines(prompt_parts, user_profile)
+        self._write_context_lines(prompt_parts, knowledge_context, similar_patterns)
         
+        schema = ",\n".join(
+            f'  "{t.value}": {{"guidance": "...", "actionable_steps": ["..."], "follow_up_suggestions": ["..."]}}'
+            for t in guidance_types
+        )
         prompt_parts.extend([
             "",
-            "Please provide:",
-            "1. Personalized guidance that combines insights from the three masters",
-            "2. 3-5 specific, actionable steps",
-            "3. 2-3 follow-up questions or suggestions",
+            "For EACH guidance type provide personalized guidance that combines insights from the three masters,",
+            "3-5 specific, actionable steps and 2-3 follow-up questions or suggestions.",
             "",
             "Make the guidance deeply personal, practical, and inspiring.",
-            "Format your response with clear sections for guidance, action steps, and follow-up suggestions."
+            "Respond with only a JSON object of this shape:",
+            "{",
+            schema,
+            "}"
         ])
         
         return "\n".join(prompt_parts)
@@ -459,17 +1063,18 @@ class AgenticRAGService:
                 continue
             
             # Detect sections
-            if any(keyword in line.lower() for keyword in ['action', 'step', 'do', 'practice']):
+            if _ACTION_RE.search(line):
                 current_section = 'actions'
-            elif any(keyword in line.lower() for keyword in ['follow', 'next', 'consider', 'explore']):
+            elif _FOLLOWUP_RE.search(line):
                 current_section = 'followup'
             
             # Extract items
-            if line.startswith(('1.', '2.', '3.', '4.', '5.', '-', '•')):
+            bullet = _BULLET_RE.match(line)
+            if bullet:
                 if current_section == 'actions':
-                    actionable_steps.append(line[2:].strip() if line[1:2] in '.-)' else line[1:].strip())
+                    actionable_steps.append(bullet.group(1).strip())
                 elif current_section == 'followup':
-                    follow_up_suggestions.append(line[2:].strip() if line[1:2] in '.-)' else line[1:].strip())
+                    follow_up_suggestions.append(bullet.group(1).strip())
         
         # If no structured format found, use fallback extraction
         if not actionable_steps and not follow_up_suggestions:
@@ -502,23 +1107,15 @@ class AgenticRAGService:
                                        knowledge_context: List[Dict[str, Any]],
                                        similar_patterns: List[Dict[str, Any]]) -> float:
         """Calculate how personalized the guidance is"""
-        score = 0.0
-        
-        # Base score for having user profile
-        if user_profile.goals:
-            score += 0.2
-        if user_profile.current_habits:
-            score += 0.2
-        if user_profile.personality_traits:
-            score += 0.2
-        
-        # Bonus for knowledge context
-        if knowledge_context:
-            score += min(0.3, len(knowledge_context) * 0.1)
-        
-        # Bonus for similar patterns
-        if similar_patterns:
-            score += min(0.1, len(similar_patterns) * 0.05)
+        # 0.2 per populated profile field, plus capped bonuses for retrieved
+        # knowledge and similar-user patterns; bools count as 0/1
+        score = (
+            0.2 * bool(user_profile.goals)
+            + 0.2 * bool(user_profile.current_habits)
+            + 0.2 * bool(user_profile.personality_traits)
+            + min(0.3, len(knowledge_context) * 0.1)
+            + min(0.1, len(similar_patterns) * 0.05)
+        )
         
         return min(1.0, score)
     
@@ -527,7 +1124,7 @@ class AgenticRAGService:
         interaction_data = {
             "user_id": request.user_profile.user_id,
             "guidance_type": request.guidance_type.value,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now(),
             "personalization_score": response.personalization_score,
             "confidence": response.confidence,
             "sources_count": len(response.sources),
@@ -535,7 +1132,7 @@ class AgenticRAGService:
         }
         
         # Store interaction (you could save to database or log file)
-        logger.info(f"Interaction recorded: {interaction_data}")
+        logger.info("Interaction recorded: %s", orjson.dumps(interaction_data).decode())
     
     async def provide_daily_insights(self, user_id: str) -> Dict[str, Any]:
         """Provide daily personalized insights for a user"""
@@ -544,31 +1141,97 @@ class AgenticRAGService:
         
         user_profile = self.user_profiles[user_id]
         
-        # Generate multiple types of guidance for daily insights
-        insights = {}
+        # Serve from cache when every section is already there
+        requests = [GuidanceRequest(user_profile=user_profile, guidance_type=t) for t in DAILY_INSIGHT_TYPES]
+        cache_keys = [self._guidance_cache_key(r) for r in requests]
+        cached = [self.guidance_cache.get(k) for k in cache_keys]
+        if all(c is not None for c in cached):
+            return {t.value: c for t, c in zip(DAILY_INSIGHT_TYPES, cached)}
+        
+        # One retrieval and one completion for all three sections
+        insights = await self._generate_multi_guidance(user_profile, DAILY_INSIGHT_TYPES)
+        if insights is None:
+            # Model didn't return usable JSON; fall back to one call per type,
+            # still sharing a single batched retrieval
+            similar_patterns, knowledge_contexts = await asyncio.gather(
+                self._find_similar_user_patterns(user_profile),
+                self._retrieve_relevant_knowledge_batch(requests)
+            )
+            responses = await asyncio.gather(*(
+                self._generate_guidance(request, knowledge_context, similar_patterns)
+                for request, knowledge_context in zip(requests, knowledge_contexts)
+            ))
+            insights = {}
+            for request, key, response in zip(requests, cache_keys, responses):
+                if "error" not in response.metadata:
+                    self.guidance_cache.put(key, response)
+                self._record_interaction(request, response)
+                insights[request.guidance_type.value] = response
+            return insights
+        
+        for request, key in zip(requests, cache_keys):
+            response = insights[request.guidance_type.value]
+            self.guidance_cache.put(key, response)
+            self._record_interaction(request, response)
         
-        # Daily wisdom
-        wisdom_request = GuidanceRequest(
-            user_profile=user_profile,
-            guidance_type=GuidanceType.DAILY_WISDOM
-        )
-        insights["daily_wisdom"] = await self.get_personalized_guidance(wisdom_request)
+        return insights
+    
+    async def _generate_multi_guidance(self,
+                                       user_profile: UserProfile,
+                                       guidance_types: Tuple[GuidanceType, ...]) -> Optional[Dict[str, GuidanceResponse]]:
+        """Generate several guidance types from one retrieval and one LLM call; None if unparseable"""
+        query_parts = [_TYPE_QUERIES.get(t, "personal development") for t in guidance_types]
+        if user_profile.goals:
+            query_parts.append(f"goals: {' '.join(user_profile.goals[:3])}")
+        if user_profile.personality_traits:
+            dominant_trait = self._top_traits(user_profile)[0][0]
+            query_parts.append(f"personality: {dominant_trait}")
         
-        # Habit optimization
-        habit_request = GuidanceRequest(
-            user_profile=user_profile,
-            guidance_type=GuidanceType.HABIT_OPTIMIZATION
+        similar_patterns, knowledge_context = await asyncio.gather(
+            self._find_similar_user_patterns(user_profile),
+            self._query_knowledge(" ".join(query_parts))
         )
-        insights["habit_optimization"] = await self.get_personalized_guidance(habit_request)
         
-        # Pattern analysis
-        pattern_request = GuidanceRequest(
-            user_profile=user_profile,
-            guidance_type=GuidanceType.PATTERN_ANALYSIS
-        )
-        insights["pattern_analysis"] = await self.get_personalized_guidance(pattern_request)
+        prompt = self._build_multi_guidance_prompt(user_profile, guidance_types, knowledge_context, similar_patterns)
         
-        return insights
+        try:
+            raw = await self._run_blocking(self.gemini_client.complete, prompt)
+            sections = parse_fenced_json(raw)
+            
+            personalization_score = self._calculate_personalization_score(
+                user_profile, knowledge_context, similar_patterns
+            )
+            sources = [
+                {
+                    "title": ctx["metadata"].get("title", "Unknown"),
+                    "author": ctx["metadata"].get("author", "Unknown"),
+                    "source": ctx["metadata"].get("source", "Unknown")
+                }
+                for ctx in knowledge_context
+            ]
+            
+            insights = {}
+            for guidance_type in guidance_types:
+                section = sections[guidance_type.value]
+                insights[guidance_type.value] = GuidanceResponse(
+                    guidance_text=section["guidance"],
+                    confidence=0.85,
+                    sources=sources,
+                    actionable_steps=list(section.get("actionable_steps", []))[:5],
+                    follow_up_suggestions=list(section.get("follow_up_suggestions", []))[:3],
+                    personalization_score=personalization_score,
+                    metadata={
+                        "guidance_type": guidance_type.value,
+                        "user_id": user_profile.user_id,
+                        "generated_at": _iso_now(),
+                        "similar_patterns_found": len(similar_patterns),
+                        "knowledge_sources_used": len(knowledge_context)
+                    }
+                )
+            return insights
+        except Exception as e:
+            logger.error(f"Error generating batched guidance: {e}")
+            return None
     
     def analyze_success_patterns(self, user_id: str) -> Dict[str, Any]:
         """Analyze user's success patterns and predict future success"""
@@ -1,14 +1,259 @@
 """Google Gemini LLM Client for RAG System"""
 
+import asyncio
 import os
-from typing import Optional
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import orjson
 from llama_index.llms.gemini import Gemini
 from llama_index.embeddings.gemini import GeminiEmbedding
 from llama_index.core import Settings
 import logging
 
+try:
+    import faiss
+except ImportError:
+    # ANN lookups are optional; without faiss the semantic cache keeps the flat scan
+    faiss = None
+
 logger = logging.getLogger(__name__)
 
+# Semantic-cache size from which lookups go through an ANN index instead of
+# the flat scan, which is faster at small sizes
+ANN_MIN_ENTRIES = 1000
+# ANN candidates rescored exactly per lookup
+ANN_CANDIDATES = 8
+
+
+class SemanticResponseCache:
+    """
+    Completion cache matched by prompt embedding rather than exact text.
+    
+    Rows of L2-normalized prompt embeddings (grown by doubling) sit beside
+    the responses, so a lookup is one matrix-vector product; a hit is the
+    best row with cosine similarity >= similarity_threshold. Entries expire
+    after ttl_seconds and the least recently used one is replaced once
+    max_entries is reached. Persisted with pickle when a path is given.
+    
+    From ANN_MIN_ENTRIES rows, and when faiss is installed, ann_index
+    ("hnsw" or "lsh"; "flat" disables it) picks a few candidates that are
+    then rescored exactly. faiss indexes can't update in place, so a
+    replaced row gets a new label and the index is rebuilt once dead
+    labels outnumber live ones.
+    """
+    
+    FLUSH_EVERY = 16
+    
+    def __init__(self,
+                 path: Optional[str] = None,
+                 similarity_threshold: float = 0.92,
+                 ttl_seconds: float = 3600,
+                 max_entries: int = 1000,
+                 ann_index: str = "hnsw"):
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.ann_index = ann_index
+        self._ann = None
+        # faiss label -> row, and row -> its live label
+        self._ann_rows: List[int] = []
+        self._row_labels: List[int] = []
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._responses: List[str] = []
+        # Wall-clock times, so expiry survives a restart
+        self._created: List[float] = []
+        self._used: List[float] = []
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self.hits = 0
+        self.misses = 0
+        self._load()
+    
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def get(self, vector: np.ndarray) -> Optional[str]:
+        """Cached response for the closest live prompt, or None below the threshold"""
+        with self._lock:
+            count = len(self._responses)
+            if not count or self._vectors.shape[1] != vector.shape[0]:
+                self.misses += 1
+                return None
+            now = time.time()
+            if self._ann is None and self._ann_wanted():
+                self._build_ann()
+            
+            if self._ann is not None:
+                _, labels = self._ann.search(vector[None, :], ANN_CANDIDATES)
+                rows = np.unique([
+                    self._ann_rows[label] for label in labels[0]
+                    if label >= 0 and self._row_labels[self._ann_rows[label]] == label
+                ]).astype(np.intp)
+            else:
+                rows = np.arange(count)
+            if not rows.size:
+                self.misses += 1
+                return None
+            
+            scores = self._vectors[rows] @ vector
+            scores[np.asarray(self._created)[rows] < now - self.ttl_seconds] = -np.inf
+            best_idx = int(np.argmax(scores))
+            if scores[best_idx] < self.similarity_threshold:
+                self.misses += 1
+                return None
+            best = int(rows[best_idx])
+            self._used[best] = now
+            self.hits += 1
+            return self._responses[best]
+    
+    def put(self, vector: np.ndarray, response: str):
+        with self._lock:
+            count = len(self._responses)
+            now = time.time()
+            if self._vectors.shape[1] != vector.shape[0]:
+                # First entry, or the embedding model changed: start over
+                self._vectors = np.zeros((16, vector.shape[0]), dtype=np.float32)
+                self._responses, self._created, self._used = [], [], []
+                self._ann = None
+                count = 0
+            
+            if count >= self.max_entries:
+                # Reuse an expired row if there is one, else the least recently used
+                expired = np.flatnonzero(np.asarray(self._created) < now - self.ttl_seconds)
+                row = int(expired[0]) if expired.size else int(np.argmin(self._used))
+                self._responses[row] = response
+                self._created[row] = now
+                self._used[row] = now
+            else:
+                if count == self._vectors.shape[0]:
+                    grown = np.zeros((count * 2, vector.shape[0]), dtype=np.float32)
+                    grown[:count] = self._vectors
+                    self._vectors = grown
+                row = count
+                self._responses.append(response)
+                self._created.append(now)
+                self._used.append(now)
+            self._vectors[row] = vector
+            
+            if self._ann is not None:
+                label = self._ann.ntotal
+                self._ann.add(vector[None, :])
+                self._ann_rows.append(row)
+                if row == len(self._row_labels):
+                    self._row_labels.append(label)
+                else:
+                    self._row_labels[row] = label
+                if self._ann.ntotal > 2 * len(self._responses):
+                    # Rebuilt on the next lookup
+                    self._ann = None
+            
+            self._dirty += 1
+            if self._dirty >= self.FLUSH_EVERY:
+                self.flush()
+    
+    def _ann_wanted(self) -> bool:
+        return faiss is not None and self.ann_index != "flat" and len(self._responses) >= ANN_MIN_ENTRIES
+    
+    def _build_ann(self):
+        count = len(self._responses)
+        dim = self._vectors.shape[1]
+        if self.ann_index == "lsh":
+            # Random-projection hashes; candidates are rescored exactly anyway
+            index = faiss.IndexLSH(dim, 2 * dim)
+        else:
+            index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+            index.hnsw.efSearch = 64
+        index.add(np.ascontiguousarray(self._vectors[:count]))
+        self._ann = index
+        self._ann_rows = list(range(count))
+        self._row_labels = list(range(count))
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._responses),
+                "max_entries": self.max_entries,
+                "similarity_threshold": self.similarity_threshold,
+                "ann_index": self.ann_index if self._ann is not None else "flat",
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+    
+    def flush(self):
+        """Write the cache to disk if anything changed since the last flush"""
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            count = len(self._responses)
+            state = {
+                "vectors": self._vectors[:count],
+                "responses": self._responses,
+                "created": self._created,
+                "used": self._used
+            }
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.path)
+                self._dirty = 0
+            except OSError as e:
+                logger.error(f"Error saving semantic cache: {e}")
+    
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+            self._vectors = state["vectors"]
+            self._responses = state["responses"]
+            self._created = state["created"]
+            self._used = state["used"]
+        except Exception as e:
+            logger.error(f"Error loading semantic cache, starting empty: {e}")
+            self._vectors = np.zeros((0, 0), dtype=np.float32)
+            self._responses, self._created, self._used = [], [], []
+
+
+# JSON object inside a ``` or ```json fence in a model response
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def parse_fenced_json(text: str) -> Any:
+    """Parse a model response as JSON, unwrapping a code fence if there is one
+
+    Raises orjson.JSONDecodeError if the payload isn't valid JSON.
+    """
+    match = _JSON_FENCE_RE.search(text)
+    return orjson.loads(match.group(1) if match else text)
+
+# In-flight async completions per client, to stay under Gemini rate limits
+MAX_CONCURRENT_COMPLETIONS = 5
+
+# (source key, author and book, what to draw on) for per-perspective prompts
+_PERSPECTIVES = (
+    ("hill", "Napoleon Hill (Think and Grow Rich)", "desire, faith, organized planning and persistence"),
+    ("murphy", "Dr. Joseph Murphy (Power of Your Subconscious Mind)", "the subconscious mind, affirmation and assumption"),
+    ("ghazali", "Imam Al-Ghazali (Alchemy of Happiness)", "self-knowledge, purification of the heart and spiritual discipline"),
+)
+
+
+# Exact-prompt completions kept per client for deterministic calls
+EXACT_CACHE_SIZE = 1024
+
 
 class GeminiRAGClient:
     """
@@ -16,12 +261,23 @@ class GeminiRAGClient:
     Handles both LLM and embedding model initialization.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 cache_path: Optional[str] = None,
+                 similarity_threshold: float = 0.92,
+                 ttl_seconds: float = 3600,
+                 max_cache_entries: int = 1000,
+                 cache_ann_index: str = "hnsw"):
         """
         Initialize Gemini client with API key.
         
         Args:
             api_key: Google API key. If not provided, will use GOOGLE_API_KEY env var.
+            cache_path: File to persist the semantic response cache to; in-memory only if None
+            similarity_threshold: Minimum prompt cosine similarity for a cached completion
+            ttl_seconds: Lifetime of a cached completion
+            max_cache_entries: Cached completions kept before LRU replacement
+            cache_ann_index: "hnsw", "lsh" or "flat" lookup once the cache is large
         """
         self.api_key = api_key or os.environ.get("GOOGLE_API_KEY")
         
@@ -39,34 +295,161 @@ class GeminiRAGClient:
             max_tokens=2048
         )
         
-        # Initialize Embedding Model
+        # Initialize Embedding Model; batch size matches the API's
+        # per-request limit so bulk ingestion isn't split into batches of 10
         self.embed_model = GeminiEmbedding(
             model_name="models/embedding-001",
-            api_key=self.api_key
+            api_key=self.api_key,
+            embed_batch_size=100
         )
         
         # Set as default for LlamaIndex
         Settings.llm = self.llm
         Settings.embed_model = self.embed_model
         
+        self._completion_slots = asyncio.Semaphore(MAX_CONCURRENT_COMPLETIONS)
+        
+        # prompt -> (stored at, response), for deterministic=True calls
+        self.ttl_seconds = ttl_seconds
+        self._exact_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._exact_lock = threading.Lock()
+        
+        self.response_cache = SemanticResponseCache(
+            cache_path,
+            similarity_threshold=similarity_threshold,
+            ttl_seconds=ttl_seconds,
+            max_entries=max_cache_entries,
+            ann_index=cache_ann_index
+        )
+        
         logger.info("Gemini RAG Client initialized successfully")
     
-    def complete(self, prompt: str) -> str:
+    def complete(self, prompt: str, semantic_cache: bool = False, deterministic: bool = False) -> str:
         """
         Generate completion for a prompt.
         
         Args:
             prompt: Input prompt
+            semantic_cache: Reuse the answer to a semantically equivalent
+                earlier prompt. Only for prompts with no user data, whose
+                meaning isn't carried by a word or two (mantra identities,
+                profile lines): those would match other prompts' entries.
+            deterministic: The caller wants the same answer for the same prompt,
+                so an identical earlier prompt's answer is reused for ttl_seconds
             
         Returns:
             Generated text
         """
+        if deterministic:
+            cached = self._exact_get(prompt)
+            if cached is not None:
+                return cached
+        response = self._complete_semantic(prompt, semantic_cache)
+        if deterministic:
+            self._exact_put(prompt, response)
+        return response
+    
+    def _exact_get(self, prompt: str) -> Optional[str]:
+        with self._exact_lock:
+            entry = self._exact_cache.get(prompt)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._exact_cache[prompt]
+                return None
+            self._exact_cache.move_to_end(prompt)
+            return entry[1]
+    
+    def _exact_put(self, prompt: str, response: str):
+        with self._exact_lock:
+            self._exact_cache[prompt] = (time.monotonic(), response)
+            self._exact_cache.move_to_end(prompt)
+            while len(self._exact_cache) > EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+    
+    def _complete_semantic(self, prompt: str, semantic_cache: bool) -> str:
+        vector = None
+        if semantic_cache:
+            try:
+                vector = self.response_cache.normalize(self.embed_model.get_text_embedding(prompt))
+            except Exception as e:
+                # Cache lookups are best-effort; e.g. prompts over the embedding input limit
+                logger.warning(f"Skipping semantic cache, prompt embedding failed: {e}")
+        
+        if vector is not None:
+            cached = self.response_cache.get(vector)
+            if cached is not None:
+                return cached
+        
         try:
-            response = self.llm.complete(prompt)
-            return str(response)
+            response = str(self.llm.complete(prompt))
         except Exception as e:
             logger.error(f"Error generating completion: {e}")
             raise
+        
+        if vector is not None:
+            self.response_cache.put(vector, response)
+        return response
+    
+    async def acomplete(self, prompt: str, semantic_cache: bool = False, deterministic: bool = False) -> str:
+        """
+        Async completion with at most MAX_CONCURRENT_COMPLETIONS requests in flight.
+        
+        Args:
+            prompt: Input prompt
+            semantic_cache: Opt into the semantic cache, as for complete()
+            deterministic: Reuse an identical prompt's answer, as for complete()
+            
+        Returns:
+            Generated text
+        """
+        if deterministic:
+            cached = self._exact_get(prompt)
+            if cached is not None:
+                return cached
+        
+        async with self._completion_slots:
+            vector = None
+            if semantic_cache:
+                try:
+                    vector = self.response_cache.normalize(await self.embed_model.aget_text_embedding(prompt))
+                except Exception as e:
+                    logger.warning(f"Skipping semantic cache, prompt embedding failed: {e}")
+            
+            if vector is not None:
+                cached = self.response_cache.get(vector)
+                if cached is not None:
+                    return cached
+            
+            try:
+                response = str(await self.llm.acomplete(prompt))
+            except Exception as e:
+                logger.error(f"Error generating completion: {e}")
+                raise
+        
+        if vector is not None:
+            self.response_cache.put(vector, response)
+        if deterministic:
+            self._exact_put(prompt, response)
+        return response
+    
+    def stream_complete(self, prompt: str) -> Iterator[str]:
+        """
+        Generate completion for a prompt, yielding text as it arrives.
+        
+        Args:
+            prompt: Input prompt
+            
+        Yields:
+            Newly generated text chunks
+        """
+        try:
+            for response in self.llm.stream_complete(prompt):
+                if response.delta:
+                    yield response.delta
+        except Exception as e:
+            logger.error(f"Error streaming completion: {e}")
+            raise
     
     def synthesize_wisdom(
         self, 
@@ -89,9 +472,62 @@ class GeminiRAGClient:
         Returns:
             Synthesized wisdom
         """
-        synthesis_prompt = f"""
+        # User context never goes through the semantic cache
+        return self.complete(
+            self._synthesis_prompt(query, hill_response, murphy_response, ghazali_response, context),
+            semantic_cache=context is None
+        )
+    
+    async def asynthesize_wisdom_from_query(self, query: str, context: Optional[dict] = None) -> Dict[str, Any]:
+        """
+        Ask each of the three thinkers concurrently, then synthesize their answers.
+        
+        Args:
+            query: User's question
+            context: Additional context
+            
+        Returns:
+            The synthesis plus each perspective, keyed hill/murphy/ghazali
+        """
+        perspectives = await asyncio.gather(*(
+            self.acomplete(
+                f"Answer in the voice of {author}, drawing on {themes}.\n"
+                f"Question: {query}\n"
+                f"{f'Context: {context}' if context else ''}\n"
+                "Keep it to a short paragraph."
+            )
+            for _, author, themes in _PERSPECTIVES
+        ))
+        # User context never goes through the semantic cache
+        synthesis = await self.acomplete(
+            self._synthesis_prompt(query, *perspectives, context),
+            semantic_cache=context is None
+        )
+        return {
+            "synthesis": synthesis,
+            "sources": {key: text for (key, _, _), text in zip(_PERSPECTIVES, perspectives)}
+        }
+    
+    @staticmethod
+    def _synthesis_prompt(query: str,
+                          hill_response: str,
+                          murphy_response: str,
+                          ghazali_response: str,
+                          context: Optional[dict]) -> str:
+        # Fixed instructions first and the per-call text last, so repeat
+        # calls share the longest possible prompt prefix
+        return f"""
         You are a wisdom synthesizer combining insights from three great thinkers.
         
+        Please synthesize the three perspectives below into unified, practical wisdom.
+        Focus on:
+        1. Common themes across all three
+        2. Complementary insights
+        3. Practical application
+        4. A balanced integration
+        
+        Keep the response concise and actionable.
+        
         Question: {query}
         {f"Context: {context}" if context else ""}
         
@@ -103,18 +539,7 @@ class GeminiRAGClient:
         
         Imam Al-Ghazali (Alchemy of Happiness) says:
         {ghazali_response}
-        
-        Please synthesize these three perspectives into unified, practical wisdom.
-        Focus on:
-        1. Common themes across all three
-        2. Complementary insights
-        3. Practical application
-        4. A balanced integration
-        
-        Keep the response concise and actionable.
         """
-        
-        return self.complete(synthesis_prompt)
     
     def generate_mantra(
         self,
@@ -180,10 +605,9 @@ class GeminiRAGClient:
         Returns:
             Challenge structure with daily quests
         """
+        # Fixed scaffolding first, the identity/difficulty/context last
         prompt = f"""
-        Create a 7-day progressive challenge for someone wanting to embody being more {identity}.
-        Difficulty level: {difficulty}
-        {f"User context: {user_context}" if user_context else ""}
+        Create a 7-day progressive challenge for someone wanting to embody an identity quality.
         
         Draw inspiration from:
         - Napoleon Hill's principle of organized planning and persistence
@@ -208,21 +632,17 @@ class GeminiRAGClient:
         }}
         
         Make each day build upon the previous, starting gentle and increasing in commitment.
+        
+        Identity quality: {identity}
+        Difficulty level: {difficulty}
+        {f"User context: {user_context}" if user_context else ""}
         """
         
         response = self.complete(prompt)
         
-        # Parse JSON response
-        import json
         try:
-            # Clean up response if needed
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0]
-            
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return parse_fenced_json(response)
+        except orjson.JSONDecodeError:
             logger.error(f"Failed to parse challenge JSON: {response}")
             # Return a basic structure
             return {
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the backend tests
+"""
+
+import time
+
+import pytest
+
+
+class FakeClock:
+    """
+    Stand-in for the time module whose clock only moves when a test moves it.
+
+    Patch it over a module's `time` global rather than over time.monotonic
+    itself, so the asyncio event loop keeps the real clock.
+    """
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -1,10 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.api.api_v1.api import api_router
+from app.crud.card import start_request_cache, reset_request_cache
+from app.services.email_service import email_service
+from app.services.memory_db import seed_test_data, should_seed_test_data
+from app.services.otp_service import close_resend_client, otp_service
 # Don't import engine in dev mode to avoid database connection
 if not settings.DEV_MODE:
     from app.db.session import engine
@@ -14,13 +19,24 @@ if not settings.DEV_MODE:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Skip database creation on startup - will be done when database is available
+    if should_seed_test_data():
+        seed_test_data()
+    email_service.start_otp_sweeper()
+    email_service.start_send_workers()
+    otp_service.start_code_purger()
     yield
+    email_service.stop_otp_sweeper()
+    otp_service.stop_code_purger()
+    await email_service.stop_send_workers()
+    await email_service.aclose()
+    await close_resend_client()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -36,6 +52,17 @@ if settings.BACKEND_CORS_ORIGINS:
 
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["localhost", "127.0.0.1"])
 
+
+@app.middleware("http")
+async def card_read_cache(request, call_next):
+    # Scope the CRUDCard read cache to a single request
+    token = start_request_cache()
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_cache(token)
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
@@ -0,0 +1,194 @@
+"""
+Tests for the guidance and completion caches used by the RAG services
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.rag import agentic_rag_service, gemini_client
+from app.services.rag.agentic_rag_service import GuidanceCache, GuidanceResponse
+from app.services.rag.gemini_client import GeminiRAGClient, SemanticResponseCache
+
+
+@pytest.fixture
+def clock(clock, monkeypatch):
+    monkeypatch.setattr(agentic_rag_service, "time", clock)
+    monkeypatch.setattr(gemini_client, "time", clock)
+    return clock
+
+
+def _response(text: str) -> GuidanceResponse:
+    return GuidanceResponse(
+        guidance_text=text,
+        confidence=0.9,
+        sources=[],
+        actionable_steps=[],
+        follow_up_suggestions=[],
+        personalization_score=0.5,
+        metadata={},
+    )
+
+
+def _unit(*values: float) -> np.ndarray:
+    return SemanticResponseCache.normalize(values)
+
+
+# GuidanceCache
+
+def test_guidance_cache_expires_entries_after_ttl(clock):
+    cache = GuidanceCache(max_size=4, ttl_seconds=60)
+    cache.put(("u1", "daily"), _response("a"))
+
+    clock.now += 59
+    assert cache.get(("u1", "daily")).guidance_text == "a"
+
+    clock.now += 2
+    assert cache.get(("u1", "daily")) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_guidance_cache_evicts_least_recently_used(clock):
+    cache = GuidanceCache(max_size=2, ttl_seconds=60)
+    cache.put(("u1", "a"), _response("a"))
+    cache.put(("u1", "b"), _response("b"))
+    # Touch "a" so "b" becomes the oldest
+    cache.get(("u1", "a"))
+    cache.put(("u1", "c"), _response("c"))
+
+    assert cache.get(("u1", "b")) is None
+    assert cache.get(("u1", "a")) is not None
+    assert cache.get(("u1", "c")) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_guidance_cache_invalidate_user_only_drops_that_user(clock):
+    cache = GuidanceCache()
+    cache.put(("u1", "a"), _response("a"))
+    cache.put(("u2", "a"), _response("b"))
+
+    cache.invalidate_user("u1")
+
+    assert cache.get(("u1", "a")) is None
+    assert cache.get(("u2", "a")).guidance_text == "b"
+
+
+# SemanticResponseCache
+
+def test_semantic_cache_hits_only_at_or_above_threshold(clock):
+    cache = SemanticResponseCache(similarity_threshold=0.92, ann_index="flat")
+    cache.put(_unit(1.0, 0.0), "cached")
+
+    # cos ~= 0.95
+    assert cache.get(_unit(0.95, 0.31)) == "cached"
+    # cos ~= 0.80
+    assert cache.get(_unit(0.8, 0.6)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_semantic_cache_skips_expired_entries(clock):
+    cache = SemanticResponseCache(ttl_seconds=60, ann_index="flat")
+    cache.put(_unit(1.0, 0.0), "cached")
+
+    clock.now += 61
+    assert cache.get(_unit(1.0, 0.0)) is None
+
+
+def test_semantic_cache_replaces_least_recently_used_when_full(clock):
+    cache = SemanticResponseCache(max_entries=2, ann_index="flat")
+    cache.put(_unit(1.0, 0.0), "x")
+    clock.now += 1
+    cache.put(_unit(0.0, 1.0), "y")
+    clock.now += 1
+    cache.get(_unit(1.0, 0.0))
+    clock.now += 1
+    cache.put(_unit(-1.0, 0.0), "z")
+
+    assert cache.stats()["size"] == 2
+    assert cache.get(_unit(0.0, 1.0)) is None
+    assert cache.get(_unit(1.0, 0.0)) == "x"
+    assert cache.get(_unit(-1.0, 0.0)) == "z"
+
+
+def test_semantic_cache_resets_when_embedding_dimension_changes(clock):
+    cache = SemanticResponseCache(ann_index="flat")
+    cache.put(_unit(1.0, 0.0), "2d")
+    cache.put(_unit(1.0, 0.0, 0.0), "3d")
+
+    assert cache.stats()["size"] == 1
+    assert cache.get(_unit(1.0, 0.0)) is None
+
+
+def test_semantic_cache_round_trips_through_disk(clock, tmp_path):
+    path = str(tmp_path / "semantic_cache.pkl")
+    cache = SemanticResponseCache(path, ann_index="flat")
+    cache.put(_unit(1.0, 0.0), "persisted")
+    cache.flush()
+
+    reloaded = SemanticResponseCache(path, ann_index="flat")
+    assert reloaded.get(_unit(1.0, 0.0)) == "persisted"
+
+
+# GeminiRAGClient completion caches
+
+class FakeLLM:
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+
+    def complete(self, prompt: str) -> str:
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+class FakeEmbedding:
+    """Embeds every prompt to the same vector, so any two prompts look equivalent"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_text_embedding(self, text: str):
+        return [1.0, 0.0]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(gemini_client, "Gemini", FakeLLM)
+    monkeypatch.setattr(gemini_client, "GeminiEmbedding", FakeEmbedding)
+    monkeypatch.setattr(gemini_client, "Settings", SimpleNamespace())
+    return GeminiRAGClient(api_key="test-key", ttl_seconds=60, cache_ann_index="flat")
+
+
+def test_different_prompts_do_not_share_answers_by_default(client):
+    assert client.complete("advice for Alice") == "answer 1"
+    assert client.complete("advice for Bob") == "answer 2"
+    assert client.response_cache.stats()["size"] == 0
+
+
+def test_semantic_cache_is_opt_in_per_call(client):
+    assert client.complete("what is faith", semantic_cache=True) == "answer 1"
+    assert client.complete("define faith", semantic_cache=True) == "answer 1"
+    # A caller that doesn't opt in never sees the other prompt's answer
+    assert client.complete("define faith") == "answer 2"
+
+
+def test_exact_cache_only_serves_deterministic_calls(client, clock):
+    assert client.complete("same prompt", deterministic=True) == "answer 1"
+    assert client.complete("same prompt", deterministic=True) == "answer 1"
+    assert client.complete("same prompt") == "answer 2"
+    assert client.complete("other prompt", deterministic=True) == "answer 3"
+
+
+def test_exact_cache_expires_after_ttl(client, clock):
+    client.complete("same prompt", deterministic=True)
+    clock.now += 61
+    assert client.complete("same prompt", deterministic=True) == "answer 2"
+
+
+def test_exact_cache_is_bounded(client, monkeypatch):
+    monkeypatch.setattr(gemini_client, "EXACT_CACHE_SIZE", 3)
+    for i in range(10):
+        client.complete(f"prompt {i}", deterministic=True)
+
+    assert list(client._exact_cache) == ["prompt 7", "prompt 8", "prompt 9"]
@@ -0,0 +1,133 @@
+"""
+Tests for the dev-mode in-memory stores and their secondary indexes
+"""
+
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.api.mock_data import MockStore
+from app.services.memory_db import MemoryDatabaseService, memory_db
+
+USER_ID = UUID("12345678-1234-5678-1234-567812345678")
+
+
+# MockStore
+
+def _card(user_id=USER_ID, **fields):
+    return {"id": uuid4(), "user_id": user_id, "title": "Card", **fields}
+
+
+def test_mock_store_indexes_cards_by_user_for_uuid_and_str_ids():
+    mine, theirs = _card(), _card(user_id=uuid4())
+    store = MockStore([mine, theirs])
+
+    assert store.cards_for_user(USER_ID) == [mine]
+    assert store.cards_for_user(str(USER_ID)) == [mine]
+    assert store.find_card(str(mine["id"]), USER_ID) is mine
+    # Another user's card is not visible through this user's index
+    assert store.find_card(theirs["id"], USER_ID) is None
+
+
+def test_mock_store_remove_card_updates_index():
+    card = _card()
+    store = MockStore([card])
+
+    store.remove_card(card)
+
+    assert store.cards == []
+    assert store.cards_for_user(USER_ID) == []
+
+
+def test_mock_store_move_focus_task_between_cards():
+    first, second = _card(), _card()
+    store = MockStore([first, second])
+    task = {"id": uuid4(), "card_id": first["id"], "title": "Task"}
+    store.add_focus_task(task)
+
+    task["card_id"] = second["id"]
+    store.move_focus_task(task, first["id"])
+
+    assert store.focus_tasks_for_card(first["id"]) == []
+    assert store.focus_tasks_for_card(second["id"]) == [task]
+
+    store.remove_focus_task(task)
+    assert store.focus_tasks_for_card(second["id"]) == []
+    assert store.find_focus_task(task["id"]) is None
+
+
+def test_mock_store_daily_task_index():
+    card = _card()
+    store = MockStore([card])
+    task = {"id": uuid4(), "card_id": card["id"], "title": "Daily"}
+    store.add_daily_task(task)
+
+    assert store.daily_tasks_for_card(str(card["id"])) == [task]
+    assert store.find_daily_task(task["id"]) is task
+
+    store.remove_daily_task(task)
+    assert store.daily_tasks_for_card(card["id"]) == []
+
+
+# memory_db active card
+
+@pytest.fixture
+def db():
+    for table in memory_db.values():
+        table.clear()
+    yield MemoryDatabaseService()
+    for table in memory_db.values():
+        table.clear()
+
+
+def _statuses(user_id):
+    return {card["title"]: card["status"] for card in memory_db["cards_by_user"][user_id]}
+
+
+@pytest.mark.asyncio
+async def test_creating_an_active_card_demotes_the_previous_one(db):
+    first = await db.create_card({"title": "first", "status": "active"}, "u1")
+    second = await db.create_card({"title": "second", "status": "active"}, "u1")
+
+    assert _statuses("u1") == {"first": "queued", "second": "active"}
+    assert memory_db["active_card_by_user"]["u1"] == second["id"]
+    assert first["id"] != second["id"]
+
+
+@pytest.mark.asyncio
+async def test_activating_a_card_swaps_the_active_card(db):
+    first = await db.create_card({"title": "first", "status": "active"}, "u1")
+    second = await db.create_card({"title": "second", "position": 1}, "u1")
+
+    await db.update_card(second["id"], {"status": "active"}, "u1")
+    assert _statuses("u1") == {"first": "queued", "second": "active"}
+    assert memory_db["active_card_by_user"]["u1"] == second["id"]
+
+    # Re-activating the active card leaves it active
+    await db.update_card(second["id"], {"status": "active"}, "u1")
+    assert _statuses("u1") == {"first": "queued", "second": "active"}
+
+    await db.update_card(first["id"], {"status": "active"}, "u1")
+    assert _statuses("u1") == {"first": "active", "second": "queued"}
+    assert memory_db["active_card_by_user"]["u1"] == first["id"]
+
+
+@pytest.mark.asyncio
+async def test_pausing_or_deleting_the_active_card_clears_the_index(db):
+    card = await db.create_card({"title": "card", "status": "active"}, "u1")
+    await db.update_card(card["id"], {"status": "paused"}, "u1")
+    assert "u1" not in memory_db["active_card_by_user"]
+
+    await db.update_card(card["id"], {"status": "active"}, "u1")
+    assert await db.delete_card(card["id"], "u1") is True
+    assert "u1" not in memory_db["active_card_by_user"]
+
+
+@pytest.mark.asyncio
+async def test_active_cards_are_tracked_per_user(db):
+    mine = await db.create_card({"title": "mine", "status": "active"}, "u1")
+    await db.create_card({"title": "theirs", "status": "active"}, "u2")
+
+    assert memory_db["active_card_by_user"]["u1"] == mine["id"]
+    assert _statuses("u1") == {"mine": "active"}
+    assert _statuses("u2") == {"theirs": "active"}
@@ -0,0 +1,60 @@
+"""
+Tests for the OTP resend cooldown on the request/resend endpoints
+"""
+
+from collections import OrderedDict
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.api_v1.endpoints import auth_otp
+from app.services import email_service as email_module
+from app.services.email_service import email_service
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.setattr(email_service, "_recent_sends", OrderedDict())
+    app = FastAPI()
+    app.include_router(auth_otp.router, prefix="/auth-otp")
+    return TestClient(app)
+
+
+def _email() -> str:
+    return f"user-{uuid4().hex[:8]}@example.com"
+
+
+def test_second_request_inside_cooldown_gets_429(client):
+    email = _email()
+
+    first = client.post("/auth-otp/request-otp", json={"email": email})
+    second = client.post("/auth-otp/request-otp", json={"email": email})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+
+
+def test_resend_inside_cooldown_gets_429(client):
+    email = _email()
+
+    assert client.post("/auth-otp/request-otp", json={"email": email}).status_code == 200
+    assert client.post("/auth-otp/resend-otp", json={"email": email}).status_code == 429
+
+
+def test_cooldown_is_per_address(client):
+    assert client.post("/auth-otp/request-otp", json={"email": _email()}).status_code == 200
+    assert client.post("/auth-otp/request-otp", json={"email": _email()}).status_code == 200
+
+
+def test_request_is_allowed_again_after_cooldown(client, monkeypatch):
+    email = _email()
+    assert client.post("/auth-otp/request-otp", json={"email": email}).status_code == 200
+
+    # Age the recorded send past the window instead of sleeping
+    sent_at = email_service._recent_sends[email]
+    email_service._recent_sends[email] = sent_at - email_module.OTP_RESEND_COOLDOWN_SECONDS
+
+    assert client.post("/auth-otp/request-otp", json={"email": email}).status_code == 200
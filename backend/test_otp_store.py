@@ -0,0 +1,101 @@
+"""
+Tests for the in-memory OTP store in EmailService
+"""
+
+import pytest
+
+from app.services import email_service as email_module
+from app.services.email_service import EmailService, MAX_OTP_ATTEMPTS
+
+
+@pytest.fixture
+def clock(clock, monkeypatch):
+    monkeypatch.setattr(email_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Without REDIS_URL the store is the in-memory dict under test
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    return EmailService()
+
+
+@pytest.mark.asyncio
+async def test_verify_accepts_the_stored_code(service, clock):
+    await service.store_otp("a@example.com", "123456")
+
+    assert await service.verify_otp("a@example.com", "123456") is True
+    assert await service.verify_otp("a@example.com", "123456", purpose="activation") is False
+
+
+@pytest.mark.asyncio
+async def test_verify_rejects_expired_codes(service, clock):
+    await service.store_otp("a@example.com", "123456", expires_in_minutes=1)
+
+    clock.now += 61
+    assert await service.verify_otp("a@example.com", "123456") is False
+    assert "a@example.com:login" not in service.otp_store
+
+
+@pytest.mark.asyncio
+async def test_code_is_dropped_after_max_attempts(service, clock):
+    await service.store_otp("a@example.com", "123456")
+    for _ in range(MAX_OTP_ATTEMPTS):
+        assert await service.verify_otp("a@example.com", "000000") is False
+
+    assert await service.verify_otp("a@example.com", "123456") is False
+    assert "a@example.com:login" not in service.otp_store
+
+
+@pytest.mark.asyncio
+async def test_store_evicts_oldest_code_past_the_cap(service, clock, monkeypatch):
+    monkeypatch.setattr(email_module, "MAX_PENDING_OTPS", 3)
+    for i in range(5):
+        await service.store_otp(f"user{i}@example.com", "123456")
+
+    assert list(service.otp_store) == [
+        "user2@example.com:login",
+        "user3@example.com:login",
+        "user4@example.com:login",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reissued_code_counts_as_newest(service, clock, monkeypatch):
+    monkeypatch.setattr(email_module, "MAX_PENDING_OTPS", 2)
+    await service.store_otp("a@example.com", "111111")
+    await service.store_otp("b@example.com", "222222")
+    await service.store_otp("a@example.com", "333333")
+    await service.store_otp("c@example.com", "444444")
+
+    assert list(service.otp_store) == ["a@example.com:login", "c@example.com:login"]
+    assert await service.verify_otp("a@example.com", "333333") is True
+
+
+@pytest.mark.asyncio
+async def test_expiry_heap_stays_bounded_under_the_cap(service, clock, monkeypatch):
+    monkeypatch.setattr(email_module, "MAX_PENDING_OTPS", 5)
+    for i in range(1000):
+        await service.store_otp(f"user{i}@example.com", "123456")
+
+    assert len(service.otp_store) == 5
+    assert len(service._expiry_heap) <= 2 * len(service.otp_store)
+
+
+@pytest.mark.asyncio
+async def test_sweep_drops_expired_codes_but_not_reissued_ones(service, clock):
+    await service.store_otp("a@example.com", "111111", expires_in_minutes=1)
+    await service.store_otp("b@example.com", "222222", expires_in_minutes=1)
+    clock.now += 30
+    # Re-issued before the first code expired; its stale heap entry must not
+    # take the new code with it
+    await service.store_otp("b@example.com", "333333", expires_in_minutes=1)
+
+    clock.now += 31
+    assert service.sweep_expired_otps() == 1
+    assert list(service.otp_store) == ["b@example.com:login"]
+
+    clock.now += 30
+    assert service.sweep_expired_otps() == 1
+    assert not service.otp_store
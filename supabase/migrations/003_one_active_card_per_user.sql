@@ -0,0 +1,21 @@
+-- Enforce "only one ACTIVE card per user" in the database
+
+-- New cards start queued; with the unique index below, an insert that
+-- fell back to the old 'active' default would fail for any user who
+-- already has an active card. Activation goes through set_active_card.
+ALTER TABLE cards ALTER COLUMN status SET DEFAULT 'queued';
+
+-- Demote duplicates first, keeping the most recently worked-on active card
+UPDATE cards
+SET status = 'queued'
+WHERE status = 'active'
+AND id NOT IN (
+    SELECT DISTINCT ON (user_id) id
+    FROM cards
+    WHERE status = 'active'
+    ORDER BY user_id, last_worked_on DESC NULLS LAST, updated_at DESC
+);
+
+CREATE UNIQUE INDEX ux_cards_one_active_per_user
+ON cards (user_id)
+WHERE status = 'active';
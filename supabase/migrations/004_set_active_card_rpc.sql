@@ -0,0 +1,22 @@
+-- Atomically make one card the user's only active card
+-- Called from the backend via supabase.rpc("set_active_card", ...)
+
+CREATE OR REPLACE FUNCTION set_active_card(p_user_id UUID, p_card_id UUID)
+RETURNS SETOF cards
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE cards
+    SET status = 'queued'
+    WHERE user_id = p_user_id
+    AND status = 'active'
+    AND id <> p_card_id;
+
+    RETURN QUERY
+    UPDATE cards
+    SET status = 'active'
+    WHERE id = p_card_id
+    AND user_id = p_user_id
+    RETURNING *;
+END;
+$$;
@@ -0,0 +1,14 @@
+-- Composite indexes matching the list queries in DatabaseService
+-- (filter by owner, ORDER BY position) so Postgres can skip the sort
+
+CREATE INDEX IF NOT EXISTS ix_cards_user_position
+ON cards (user_id, position);
+
+CREATE INDEX IF NOT EXISTS ix_focus_tasks_card_position
+ON focus_tasks (card_id, position);
+
+CREATE INDEX IF NOT EXISTS ix_daily_tasks_user_position
+ON daily_tasks (user_id, position);
+
+-- The "deactivate other active cards" lookup is served by the partial
+-- unique index ux_cards_one_active_per_user (003).
@@ -0,0 +1,15 @@
+-- Stamp focus_tasks.last_touched on the server instead of from the backend
+
+ALTER TABLE focus_tasks ADD COLUMN IF NOT EXISTS last_touched TIMESTAMPTZ DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION update_last_touched_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.last_touched = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_focus_tasks_last_touched
+BEFORE UPDATE ON focus_tasks
+FOR EACH ROW EXECUTE FUNCTION update_last_touched_column();
@@ -0,0 +1,26 @@
+-- Time-ordered (RFC 9562 version 7) UUIDs generated by Postgres, so inserts
+-- don't carry an id and new rows append to the right of the primary key index.
+-- Reuses gen_random_uuid() for the random bits, then overwrites the first
+-- 48 bits with the Unix epoch in milliseconds and flips the version to 7.
+
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS UUID AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::BIGINT) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::UUID;
+$$ LANGUAGE sql VOLATILE;
+
+ALTER TABLE cards ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE focus_tasks ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE daily_tasks ALTER COLUMN id SET DEFAULT uuid_generate_v7();
@@ -0,0 +1,26 @@
+-- OTP codes for passwordless login (OTPService). code_hash holds the raw
+-- 32-byte SHA-256 digest rather than its 64-char hex spelling, halving the
+-- bytes stored, shipped and compared per verification.
+
+CREATE TABLE IF NOT EXISTS auth_codes (
+    email TEXT PRIMARY KEY,
+    code_hash BYTEA NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    used_at TIMESTAMPTZ,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+
+-- Convert an existing hex-text column in place
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'auth_codes'
+        AND column_name = 'code_hash'
+        AND data_type <> 'bytea'
+    ) THEN
+        ALTER TABLE auth_codes
+        ALTER COLUMN code_hash TYPE BYTEA USING decode(code_hash, 'hex');
+    END IF;
+END $$;
@@ -0,0 +1,5 @@
+-- Index for the expired-code cleanup, which removes used and unused rows
+-- alike. Lookups by email already go through the auth_codes primary key.
+
+CREATE INDEX IF NOT EXISTS auth_codes_expires_idx
+ON auth_codes (expires_at);
@@ -0,0 +1,21 @@
+-- Delete consumed codes and codes expired before p_before
+-- Called from the backend via supabase.rpc("purge_auth_codes", ...) on a timer.
+-- The advisory lock lets only one worker purge at a time; the others skip.
+
+CREATE OR REPLACE FUNCTION purge_auth_codes(p_before TIMESTAMPTZ, p_lock_key BIGINT)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    deleted INTEGER := 0;
+BEGIN
+    IF pg_try_advisory_xact_lock(p_lock_key) THEN
+        DELETE FROM auth_codes
+        WHERE expires_at < p_before
+        OR used_at IS NOT NULL;
+        GET DIAGNOSTICS deleted = ROW_COUNT;
+    END IF;
+
+    RETURN deleted;
+END;
+$$;
@@ -0,0 +1,40 @@
+-- Store task lane/status/duration as text with CHECK constraints, matching
+-- the String(16) + CheckConstraint mapping in app.models.focus_task and
+-- app.models.daily_task. Allowed values are unchanged from the 001 ENUMs.
+-- Defaults are dropped first because they are typed as the old ENUMs.
+
+ALTER TABLE focus_tasks ALTER COLUMN lane DROP DEFAULT;
+ALTER TABLE focus_tasks ALTER COLUMN status DROP DEFAULT;
+
+ALTER TABLE focus_tasks
+    ALTER COLUMN lane TYPE VARCHAR(16) USING lane::text,
+    ALTER COLUMN status TYPE VARCHAR(16) USING status::text;
+
+ALTER TABLE focus_tasks ALTER COLUMN lane SET DEFAULT 'controller';
+ALTER TABLE focus_tasks ALTER COLUMN status SET DEFAULT 'pending';
+
+ALTER TABLE focus_tasks
+    ADD CONSTRAINT ck_focus_tasks_lane CHECK (lane IN ('controller', 'main')),
+    ADD CONSTRAINT ck_focus_tasks_status CHECK (status IN ('pending', 'active', 'completed', 'archived'));
+
+ALTER TABLE daily_tasks ALTER COLUMN lane DROP DEFAULT;
+ALTER TABLE daily_tasks ALTER COLUMN status DROP DEFAULT;
+
+ALTER TABLE daily_tasks
+    ALTER COLUMN lane TYPE VARCHAR(16) USING lane::text,
+    ALTER COLUMN duration TYPE VARCHAR(16) USING duration::text,
+    ALTER COLUMN status TYPE VARCHAR(16) USING status::text;
+
+ALTER TABLE daily_tasks ALTER COLUMN lane SET DEFAULT 'controller';
+ALTER TABLE daily_tasks ALTER COLUMN status SET DEFAULT 'pending';
+
+ALTER TABLE daily_tasks
+    ADD CONSTRAINT ck_daily_tasks_lane CHECK (lane IN ('controller', 'main')),
+    ADD CONSTRAINT ck_daily_tasks_duration CHECK (duration IN ('10min', '15min', '30min')),
+    ADD CONSTRAINT ck_daily_tasks_status CHECK (status IN ('pending', 'completed', 'archived'));
+
+DROP TYPE IF EXISTS task_lane;
+DROP TYPE IF EXISTS daily_task_lane;
+DROP TYPE IF EXISTS task_status;
+DROP TYPE IF EXISTS daily_task_status;
+DROP TYPE IF EXISTS task_duration;